@@ -0,0 +1,113 @@
+"""Import-time and bundle-size benchmark for st_chat_input_multimodal.
+
+Usage (from the repository root, after `npm run build` in the frontend):
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --max-import-ms 30 --max-initial-kb 200
+
+Import time is the median over several fresh interpreters, minus the time
+taken to import Streamlit itself, so it reflects only the package's own cost.
+Bundle sizes are split into the assets loaded by `index.html` and the chunks
+loaded on demand (e.g. the voice input code). Exits with status 1 if a
+measured value exceeds its budget.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_DIR = os.path.join(ROOT_DIR, "st_chat_input_multimodal", "frontend", "build")
+
+DEFAULT_RUNS = 7
+DEFAULT_MAX_IMPORT_MS = 50.0
+DEFAULT_MAX_INITIAL_KB = 250.0
+
+
+def _measure_import_ms(module: str) -> float:
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT_DIR)
+    return float(output.decode().strip())
+
+
+def _measure_package_import_ms(runs: int) -> float:
+    package_times: List[float] = []
+    streamlit_times: List[float] = []
+
+    for _ in range(runs):
+        streamlit_times.append(_measure_import_ms("streamlit"))
+        package_times.append(_measure_import_ms("st_chat_input_multimodal"))
+
+    return max(
+        statistics.median(package_times) - statistics.median(streamlit_times), 0.0
+    )
+
+
+def _measure_bundle_kb() -> Tuple[Dict[str, float], Dict[str, float]]:
+    with open(os.path.join(BUILD_DIR, "index.html"), encoding="utf-8") as index:
+        referenced = set(re.findall(r'(?:src|href)="\./([^"]+)"', index.read()))
+
+    initial: Dict[str, float] = {}
+    deferred: Dict[str, float] = {}
+
+    for dirpath, _, filenames in os.walk(BUILD_DIR):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            relative_path = os.path.relpath(path, BUILD_DIR).replace(os.sep, "/")
+            if not relative_path.endswith((".js", ".css")):
+                continue
+
+            size_kb = os.path.getsize(path) / 1024
+            if relative_path in referenced:
+                initial[relative_path] = size_kb
+            else:
+                deferred[relative_path] = size_kb
+
+    return initial, deferred
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--max-import-ms", type=float, default=DEFAULT_MAX_IMPORT_MS)
+    parser.add_argument("--max-initial-kb", type=float, default=DEFAULT_MAX_INITIAL_KB)
+    args = parser.parse_args()
+
+    failed = False
+
+    import_ms = _measure_package_import_ms(args.runs)
+    print(f"import st_chat_input_multimodal: {import_ms:.1f} ms (over streamlit)")
+    if import_ms > args.max_import_ms:
+        print(f"  exceeds budget of {args.max_import_ms:.1f} ms")
+        failed = True
+
+    if not os.path.isfile(os.path.join(BUILD_DIR, "index.html")):
+        print("frontend build not found; run `npm run build` to measure bundle size")
+        return 1 if failed else 0
+
+    initial, deferred = _measure_bundle_kb()
+    initial_kb = sum(initial.values())
+    print(f"initial bundle: {initial_kb:.1f} KB")
+    for name, size_kb in sorted(initial.items()):
+        print(f"  {name}: {size_kb:.1f} KB")
+    print(f"on-demand chunks: {sum(deferred.values()):.1f} KB")
+    for name, size_kb in sorted(deferred.items()):
+        print(f"  {name}: {size_kb:.1f} KB")
+
+    if initial_kb > args.max_initial_kb:
+        print(f"  initial bundle exceeds budget of {args.max_initial_kb:.1f} KB")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
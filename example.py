@@ -1,6 +1,5 @@
 import streamlit as st
-import base64
-from st_chat_input_multimodal import multimodal_chat_input
+from st_chat_input_multimodal import ChatHistory, multimodal_chat_input
 
 # Page configuration
 st.set_page_config(
@@ -88,9 +87,10 @@ with st.expander("API Specification"):
     """)
 
 
-# Manage history in session state
+# Manage history in session state. File payloads are kept in a blob store
+# and only the messages' text and metadata stay in the session.
 if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
+    st.session_state.chat_history = ChatHistory()
 
 # Input for new messages
 chat_result = multimodal_chat_input(
@@ -99,39 +99,32 @@ chat_result = multimodal_chat_input(
     key="chat_input",
 )
 if chat_result:
-    st.session_state.chat_history.append(chat_result)
+    try:
+        st.session_state.chat_history.append(chat_result)
+    except ValueError:
+        st.error("An attached file could not be read.")
 
-# Display chat history
-if st.session_state.chat_history:
-    for i, message in enumerate(st.session_state.chat_history):
-        with st.chat_message("user"):
-            if message.get("text"):
-                st.write(message["text"])
+# Display the latest messages; thumbnails are decoded once and cached
+for message in st.session_state.chat_history.latest(50):
+    with st.chat_message(message.role):
+        if message.text:
+            st.write(message.text)
 
-            if message.get("files"):
-                for file in message["files"]:
-                    try:
-                        base64_data = (
-                            file["data"].split(",")[1]
-                            if "," in file["data"]
-                            else file["data"]
-                        )
-                        image_bytes = base64.b64decode(base64_data)
-                        st.image(image_bytes, caption=file["name"], width=200)
-                    except Exception:
-                        st.write(f"📎 {file['name']}")
+        for file in message.files:
+            thumbnail = st.session_state.chat_history.get_thumbnail(file)
+            if thumbnail is None:
+                st.write(f"📎 {file.name}")
+            else:
+                st.image(thumbnail, caption=file.name, width=200)
 
-            # Display voice input information
-            if (
-                message.get("audio_metadata")
-                and message["audio_metadata"]["used_voice_input"]
-            ):
-                st.caption(
-                    f"🎤 Voice input ({message['audio_metadata']['transcription_method']})"
-                )
+        # Display voice input information
+        if message.audio_metadata and message.audio_metadata["used_voice_input"]:
+            st.caption(
+                f"🎤 Voice input ({message.audio_metadata['transcription_method']})"
+            )
 
 
 # Clear history
 if st.button("Clear History"):
-    st.session_state.chat_history = []
+    st.session_state.chat_history.clear()
     st.rerun()
@@ -1,13 +1,30 @@
 import base64
 import binascii
 import hashlib
+import importlib
+import json
 import logging
 import os
+import sys
+import zlib
 from io import BytesIO
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 import streamlit as st
-import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+if TYPE_CHECKING:
+    from st_chat_input_multimodal.history import (  # noqa: F401
+        ChatHistory,
+        HistoryFile,
+        HistoryMessage,
+        SQLiteBlobStore,
+    )
+    from st_chat_input_multimodal.transcription import (  # noqa: F401
+        TranscriptionBatchScheduler,
+        TranscriptionEngine,
+        TranscriptionItem,
+    )
 
 # Create a _RELEASE constant. We'll set this to False while we're developing
 # the component, and True when we're ready to package and distribute it.
@@ -20,7 +37,7 @@ _DEFAULT_MAX_FILES = 5
 _MIN_RECORDING_TIME = 1
 _MAX_RECORDING_TIME = 300
 _TRANSCRIPTION_REQUEST_TYPE = "transcription_request"
-_VALID_VOICE_RECOGNITION_METHODS = {"web_speech", "openai_whisper"}
+_VALID_VOICE_RECOGNITION_METHODS = {"web_speech", "openai_whisper", "local"}
 _AUDIO_FILENAME_BY_MIME_TYPE = {
     "audio/mp4": "recording.m4a",
     "audio/mpeg": "recording.mp3",
@@ -43,36 +60,274 @@ _TRANSCRIPTION_FALLBACK_MESSAGE = "Voice transcription failed. Please try again.
 _TRANSCRIPTION_INVALID_AUDIO_STATUS_CODES = {400, 413, 415, 422}
 _TRANSCRIPTION_NOT_AVAILABLE_STATUS_CODES = {401, 403, 404}
 _TRANSCRIPTION_TEMPORARY_STATUS_CODES = {408, 409, 429}
+_SESSION_STATE_NAMESPACE = "_st_chat_input_multimodal"
+_BINARY_HEADER_LENGTH_BYTES = 4
+_BINARY_PART_MARKER = "__binary_part__"
+_AUDIO_DIGEST_SAMPLE_SIZE = 4096
+
+# Optional helpers are imported on first access to keep the package import cheap.
+_LAZY_EXPORTS = {
+    "ChatHistory": "st_chat_input_multimodal.history",
+    "HistoryFile": "st_chat_input_multimodal.history",
+    "HistoryMessage": "st_chat_input_multimodal.history",
+    "SQLiteBlobStore": "st_chat_input_multimodal.history",
+    "TranscriptionBatchScheduler": "st_chat_input_multimodal.transcription",
+    "TranscriptionEngine": "st_chat_input_multimodal.transcription",
+    "TranscriptionItem": "st_chat_input_multimodal.transcription",
+}
 
 _LOGGER = logging.getLogger(__name__)
+# Run marker of fragment-only reruns, which are not counted as reruns.
+_FRAGMENT_RUN = object()
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
+_component_func: Optional[Callable[..., Any]] = None
+
+
+def _get_component_func() -> Callable[..., Any]:
+    # Declare the Streamlit component on first use rather than at import time,
+    # so importing the package stays cheap. `declare_component` returns a
+    # function that is used to create instances of the component; it is kept
+    # private and wrapped by `multimodal_chat_input`, our public API.
+    global _component_func
+
+    if _component_func is None:
+        import streamlit.components.v1 as components
+
+        if not _RELEASE:
+            _component_func = components.declare_component(
+                "st_chat_input_multimodal",
+                url="http://localhost:3000",
+            )
+        else:
+            # When we're distributing a production version of the component,
+            # we point `path` to the component's build directory, so you'll
+            # need to have the component built first.
+            parent_dir = os.path.dirname(os.path.abspath(__file__))
+            build_dir = os.path.join(parent_dir, "frontend/build")
+            _component_func = components.declare_component(
+                "st_chat_input_multimodal", path=build_dir
+            )
 
-# Declare a Streamlit component. `declare_component` returns a function
-# that is used to create instances of the component. We're naming this
-# function "_component_func", with an underscore prefix, because we don't want
-# to expose it directly to users. Instead, we'll create a custom wrapper
-# function, below, that will serve as our component's public API.
+    return _component_func
 
-# It's worth noting that this call will import `my_component.frontend.build`,
-# so you'll need to have the component built first.
 
-if not _RELEASE:
-    _component_func = components.declare_component(
-        "st_chat_input_multimodal",
-        url="http://localhost:3000",
+class _KeyState:
+    """Per-key state of a rendered component, kept in one compact record."""
+
+    __slots__ = (
+        "last_value_id",
+        "processed_request",
+        "transcription_result",
+        "transcription_error",
+        "transcription_feedback_id",
+        "last_rendered_run",
+        "request_fingerprint_cache",
+        "fallback_fingerprint_cache",
+        "last_binary_value_key",
     )
-else:
-    # When we're distributing a production version of the component, we'll
-    # replace the `url` param with `path`, and point it to to the component's
-    # build directory:
-    parent_dir = os.path.dirname(os.path.abspath(__file__))
-    build_dir = os.path.join(parent_dir, "frontend/build")
-    _component_func = components.declare_component(
-        "st_chat_input_multimodal", path=build_dir
+
+    def __init__(self, last_rendered_run: int = 0) -> None:
+        self.last_value_id: Any = None
+        self.processed_request: Optional[str] = None
+        self.transcription_result: Optional[str] = None
+        self.transcription_error: Optional[str] = None
+        self.transcription_feedback_id: Optional[str] = None
+        self.last_rendered_run = last_rendered_run
+        self.request_fingerprint_cache: Optional[Tuple[Tuple[Any, ...], str]] = None
+        # Holds the current component value itself, which Streamlit keeps alive
+        # anyway; dropped as soon as the value is no longer a request.
+        self.fallback_fingerprint_cache: Optional[Tuple[Dict[str, Any], str]] = None
+        self.last_binary_value_key: Optional[Tuple[int, bytes]] = None
+
+
+class _ComponentSessionState:
+    """All state the component keeps for one Streamlit session.
+
+    Streamlit does not expose a run counter, so each run is identified by a
+    marker object that only lives for that run (see `_get_run_marker`). Without
+    a script run context, a rerun is detected when a key is rendered a second
+    time instead; component keys are unique within a run.
+
+    Streamlit keeps the last value of an evicted input, so the identities of
+    the values it already consumed are kept as tombstones and restored when
+    the key is rendered again; an old submission is never returned twice.
+    """
+
+    __slots__ = (
+        "records",
+        "tombstones",
+        "run_count",
+        "run_marker",
+        "rendered_this_run",
+        "max_idle_reruns",
     )
 
+    def __init__(self) -> None:
+        self.records: Dict[str, _KeyState] = {}
+        self.tombstones: Dict[str, Tuple[Any, Optional[str]]] = {}
+        self.run_count = 0
+        self.run_marker: Any = None
+        self.rendered_this_run: Set[str] = set()
+        self.max_idle_reruns: Optional[int] = None
+
+    def observe_run(self, run_marker: Any) -> None:
+        if (
+            run_marker is None
+            or run_marker is _FRAGMENT_RUN
+            or run_marker is self.run_marker
+        ):
+            return
+
+        # Keep a reference so the marker cannot be reused by a later run.
+        self.run_marker = run_marker
+        self.run_count += 1
+        self.rendered_this_run.clear()
+
+    def mark_rendered(self, key: str, run_marker: Any = None) -> _KeyState:
+        if run_marker is not None:
+            self.observe_run(run_marker)
+        elif key in self.rendered_this_run:
+            self.run_count += 1
+            self.rendered_this_run.clear()
+
+        self.rendered_this_run.add(key)
+
+        record = self.records.get(key)
+        if record is None:
+            record = _KeyState(self.run_count)
+            tombstone = self.tombstones.pop(key, None)
+            if tombstone is not None:
+                record.last_value_id, record.processed_request = tombstone
+            self.records[key] = record
+        else:
+            record.last_rendered_run = self.run_count
+
+        self.evict_stale()
+        return record
+
+    def evict_stale(self) -> None:
+        if self.max_idle_reruns is None:
+            return
+
+        stale_keys = [
+            key
+            for key, record in self.records.items()
+            if self.run_count - record.last_rendered_run > self.max_idle_reruns
+        ]
+        for key in stale_keys:
+            record = self.records.pop(key)
+            self.tombstones[key] = (record.last_value_id, record.processed_request)
+            self.rendered_this_run.discard(key)
+
+    def memory_usage(self) -> Dict[str, int]:
+        return {
+            key: _estimate_size(key)
+            + sys.getsizeof(record)
+            + sum(
+                _estimate_size(getattr(record, slot))
+                for slot in _KeyState.__slots__
+                if slot != "fallback_fingerprint_cache"
+            )
+            for key, record in self.records.items()
+        }
+
+
+def _estimate_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(
+            _estimate_size(item_key) + _estimate_size(item_value)
+            for item_key, item_value in value.items()
+        )
+    elif isinstance(value, (list, tuple)):
+        size += sum(_estimate_size(item) for item in value)
+
+    return size
+
+
+def _get_component_session_state() -> _ComponentSessionState:
+    session_state = st.session_state.get(_SESSION_STATE_NAMESPACE)
+    if not isinstance(session_state, _ComponentSessionState):
+        session_state = _ComponentSessionState()
+        st.session_state[_SESSION_STATE_NAMESPACE] = session_state
+
+    return session_state
+
+
+def _get_run_marker() -> Any:
+    # ScriptRunContext.reset() gives every run a fresh cursors dict, which makes
+    # its identity a per-run token. Fragment-only runs reset it too, but they
+    # leave the rest of the page alone and must not age other inputs.
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
 
-def _build_session_state_key(key: str, suffix: str) -> str:
-    return f"_st_chat_input_multimodal_{suffix}_{key}"
+    if getattr(ctx, "fragment_ids_this_run", None):
+        return _FRAGMENT_RUN
+
+    return ctx.cursors
+
+
+def _get_value_identity(value: Any) -> Any:
+    # Submissions carry a unique timestamp, so it identifies the value without
+    # keeping the (possibly large) file payloads in session state.
+    if isinstance(value, dict) and "_timestamp" in value:
+        return value["_timestamp"]
+
+    return value
+
+
+def configure_session_state(max_idle_reruns: Optional[int] = None) -> None:
+    """
+    Configure how long per-key component state is kept in the current session
+
+    Reruns are counted whenever an input is rendered or this function is
+    called. Call it once per run, e.g. at the top of every page, so that runs
+    rendering no input also count towards `max_idle_reruns`.
+
+    Parameters
+    ----------
+    max_idle_reruns : int, optional
+        Drop the state of inputs whose key has not been rendered within this
+        many reruns. None (the default) keeps the state for the whole session.
+    """
+
+    if max_idle_reruns is not None and not _is_positive_integer(max_idle_reruns):
+        raise ValueError("max_idle_reruns must be a positive integer")
+
+    session_state = _get_component_session_state()
+    session_state.observe_run(_get_run_marker())
+    session_state.max_idle_reruns = max_idle_reruns
+    session_state.evict_stale()
+
+
+def get_session_state_usage() -> Dict[str, int]:
+    """
+    Report the approximate memory held by the component in the current session
+
+    Returns
+    -------
+    dict
+        Mapping of component key to its state size in bytes
+    """
+
+    return _get_component_session_state().memory_usage()
 
 
 def _get_transcription_request(value: Any) -> Optional[Dict[str, Any]]:
@@ -85,23 +340,176 @@ def _get_transcription_request(value: Any) -> Optional[Dict[str, Any]]:
     return value
 
 
+def _get_audio_sample_digest(audio_data: Union[str, bytes]) -> str:
+    # CRC-32 of the first and last _AUDIO_DIGEST_SAMPLE_SIZE units, so the cost
+    # does not depend on the recording length. Mirrored by getAudioSampleDigest
+    # in the frontend; data URLs are ASCII, so characters map to bytes.
+    if len(audio_data) > 2 * _AUDIO_DIGEST_SAMPLE_SIZE:
+        samples = [
+            audio_data[:_AUDIO_DIGEST_SAMPLE_SIZE],
+            audio_data[-_AUDIO_DIGEST_SAMPLE_SIZE:],
+        ]
+    else:
+        samples = [audio_data]
+
+    digest = 0
+    for sample in samples:
+        digest = zlib.crc32(
+            sample.encode("utf-8") if isinstance(sample, str) else sample, digest
+        )
+
+    return f"{digest:08x}"
+
+
+def _is_verified_transcription_request(request: Dict[str, Any]) -> bool:
+    audio_data = request.get("audio_data")
+    if not isinstance(audio_data, (str, bytes)):
+        return False
+
+    audio_size = request.get("audio_size")
+    if isinstance(audio_size, bool) or audio_size != len(audio_data):
+        return False
+
+    return request.get("audio_digest") == _get_audio_sample_digest(audio_data)
+
+
 def _get_transcription_request_fingerprint(request: Dict[str, Any]) -> str:
     request_id = str(request.get("request_id", "")).strip()
     if request_id:
-        return request_id
+        # Requests without a digest come from older frontends; trust the id.
+        if "audio_digest" not in request or _is_verified_transcription_request(request):
+            return request_id
 
     audio_data = request.get("audio_data")
+    if isinstance(audio_data, bytes) and audio_data:
+        return hashlib.sha256(audio_data).hexdigest()
+
     if not isinstance(audio_data, str) or not audio_data:
         return hashlib.sha256(repr(request).encode("utf-8")).hexdigest()
 
     return hashlib.sha256(audio_data.encode("utf-8")).hexdigest()
 
 
-def _decode_audio_data(audio_data: str) -> Tuple[bytes, str]:
+def _get_transcription_request_memo_key(
+    request: Dict[str, Any],
+) -> Optional[Tuple[Any, ...]]:
+    audio_data = request.get("audio_data")
+    request_id = str(request.get("request_id", "")).strip()
+    if not request_id or not isinstance(audio_data, (str, bytes)):
+        return None
+
+    return (request_id, len(audio_data), request.get("audio_digest"))
+
+
+def _get_cached_transcription_request_fingerprint(
+    record: _KeyState, request: Dict[str, Any]
+) -> str:
+    # The component value stays the same across reruns until the next
+    # submission, so the fingerprint is computed once per request and key.
+    # Fingerprints from a trusted request id are memoized by that id; all
+    # others by the identity of the request object, which Streamlit returns
+    # unchanged until a new value arrives, so different content never matches.
+    memo_key = _get_transcription_request_memo_key(request)
+    cache = record.request_fingerprint_cache
+    if memo_key is not None and cache is not None and cache[0] == memo_key:
+        return cache[1]
+
+    fallback_cache = record.fallback_fingerprint_cache
+    if fallback_cache is not None and fallback_cache[0] is request:
+        return fallback_cache[1]
+
+    request_fingerprint = _get_transcription_request_fingerprint(request)
+    if memo_key is not None and request_fingerprint == memo_key[0]:
+        record.request_fingerprint_cache = (memo_key, request_fingerprint)
+    else:
+        record.fallback_fingerprint_cache = (request, request_fingerprint)
+
+    return request_fingerprint
+
+
+def _restore_binary_parts(value: Any, parts: List[bytes]) -> Any:
+    if isinstance(value, dict):
+        part_index = value.get(_BINARY_PART_MARKER)
+        if len(value) == 1 and part_index is not None:
+            if not isinstance(part_index, int) or not 0 <= part_index < len(parts):
+                raise ValueError("binary payload is invalid")
+            return parts[part_index]
+
+        return {
+            item_key: _restore_binary_parts(item_value, parts)
+            for item_key, item_value in value.items()
+        }
+
+    if isinstance(value, list):
+        return [_restore_binary_parts(item, parts) for item in value]
+
+    return value
+
+
+def _get_binary_value_key(payload: bytes) -> Optional[Tuple[int, bytes]]:
+    # The JSON header carries the submission timestamp or transcription request
+    # id, so together with the length it identifies a payload without reading
+    # the binary parts.
+    header_end = _BINARY_HEADER_LENGTH_BYTES + int.from_bytes(
+        payload[:_BINARY_HEADER_LENGTH_BYTES], "big"
+    )
+    if len(payload) < _BINARY_HEADER_LENGTH_BYTES or len(payload) < header_end:
+        return None
+
+    return len(payload), payload[:header_end]
+
+
+def _decode_binary_value(payload: bytes) -> Any:
+    """Decode a value sent by the frontend in binary transport mode.
+
+    The payload is a 4-byte big-endian header length, a UTF-8 JSON header
+    ``{"value": ..., "parts": [length, ...]}`` and the raw binary parts, in
+    order. Inside ``value`` each binary field is replaced by
+    ``{"__binary_part__": index}``.
+    """
+
+    header_end = _BINARY_HEADER_LENGTH_BYTES + int.from_bytes(
+        payload[:_BINARY_HEADER_LENGTH_BYTES], "big"
+    )
+    if len(payload) < _BINARY_HEADER_LENGTH_BYTES or len(payload) < header_end:
+        raise ValueError("binary payload is invalid")
+
+    try:
+        header = json.loads(
+            payload[_BINARY_HEADER_LENGTH_BYTES:header_end].decode("utf-8")
+        )
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError("binary payload is invalid") from exc
+
+    part_lengths = header.get("parts") if isinstance(header, dict) else None
+    if not isinstance(part_lengths, list) or not all(
+        isinstance(length, int) and not isinstance(length, bool) and length >= 0
+        for length in part_lengths
+    ):
+        raise ValueError("binary payload is invalid")
+
+    payload_view = memoryview(payload)
+    parts: List[bytes] = []
+    offset = header_end
+    for length in part_lengths:
+        parts.append(bytes(payload_view[offset : offset + length]))
+        offset += length
+
+    if offset != len(payload):
+        raise ValueError("binary payload is invalid")
+
+    return _restore_binary_parts(header.get("value"), parts)
+
+
+def _decode_audio_data(
+    audio_data: Union[str, bytes], mime_type: str = "audio/webm"
+) -> Tuple[bytes, str]:
     if not audio_data:
         raise ValueError("audio_data is required for transcription")
 
-    mime_type = "audio/webm"
+    if isinstance(audio_data, bytes):
+        return audio_data, mime_type.lower()
+
     encoded_audio = audio_data
 
     if audio_data.startswith("data:"):
@@ -118,17 +526,25 @@ def _decode_audio_data(audio_data: str) -> Tuple[bytes, str]:
 
 
 def _transcribe_audio(
-    audio_data: str,
+    audio_data: Union[str, bytes],
     language: str,
-    openai_api_key: str,
+    openai_api_key: Optional[str],
+    mime_type: str = "audio/webm",
+    transcription_scheduler: Optional["TranscriptionBatchScheduler"] = None,
 ) -> str:
+    audio_bytes, mime_type = _decode_audio_data(audio_data, mime_type)
+    language_code = language.split("-")[0].strip() if language else ""
+
+    if transcription_scheduler is not None:
+        return transcription_scheduler.transcribe(
+            audio_bytes, mime_type=mime_type, language=language_code
+        ).strip()
+
     from openai import OpenAI
 
-    audio_bytes, mime_type = _decode_audio_data(audio_data)
     audio_buffer = BytesIO(audio_bytes)
     audio_buffer.name = _AUDIO_FILENAME_BY_MIME_TYPE.get(mime_type, "recording.webm")
 
-    language_code = language.split("-")[0].strip() if language else ""
     client = OpenAI(api_key=openai_api_key)
     response = client.audio.transcriptions.create(
         model="whisper-1",
@@ -166,27 +582,30 @@ def _get_transcription_error_message(exc: Exception) -> str:
 
 
 def _set_transcription_feedback(
-    *,
-    processed_request_key: str,
+    record: _KeyState,
     request_fingerprint: str,
-    transcription_result_key: str,
-    transcription_error_key: str,
-    transcription_feedback_id_key: str,
+    *,
     transcription_result: Optional[str] = None,
     transcription_error: Optional[str] = None,
 ) -> None:
-    st.session_state[processed_request_key] = request_fingerprint
-    st.session_state[transcription_feedback_id_key] = request_fingerprint
-
-    if transcription_result is None:
-        st.session_state.pop(transcription_result_key, None)
-    else:
-        st.session_state[transcription_result_key] = transcription_result
-
-    if transcription_error is None:
-        st.session_state.pop(transcription_error_key, None)
-    else:
-        st.session_state[transcription_error_key] = transcription_error
+    record.processed_request = request_fingerprint
+    record.transcription_feedback_id = request_fingerprint
+    record.transcription_result = transcription_result
+    record.transcription_error = transcription_error
+
+
+def _pop_transcription_feedback(
+    record: _KeyState,
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    feedback = (
+        record.transcription_result,
+        record.transcription_error,
+        record.transcription_feedback_id,
+    )
+    record.transcription_result = None
+    record.transcription_error = None
+    record.transcription_feedback_id = None
+    return feedback
 
 
 def _is_positive_integer(value: Any) -> bool:
@@ -199,6 +618,7 @@ def _validate_component_parameters(
     max_files: int,
     max_recording_time: int,
     voice_recognition_method: str,
+    transcription_scheduler: Optional["TranscriptionBatchScheduler"] = None,
 ) -> None:
     if max_chars is not None and not _is_positive_integer(max_chars):
         raise ValueError("max_chars must be a positive integer")
@@ -221,7 +641,19 @@ def _validate_component_parameters(
         or voice_recognition_method not in _VALID_VOICE_RECOGNITION_METHODS
     ):
         raise ValueError(
-            "voice_recognition_method must be 'web_speech' or 'openai_whisper'"
+            "voice_recognition_method must be 'web_speech', 'openai_whisper' "
+            "or 'local'"
+        )
+
+    if voice_recognition_method == "local" and transcription_scheduler is None:
+        raise ValueError(
+            "transcription_scheduler is required when voice_recognition_method "
+            "is 'local'"
+        )
+
+    if voice_recognition_method != "local" and transcription_scheduler is not None:
+        raise ValueError(
+            "transcription_scheduler requires voice_recognition_method='local'"
         )
 
 
@@ -237,6 +669,8 @@ def multimodal_chat_input(
     openai_api_key: Optional[str] = None,
     voice_language: str = "ja-JP",
     max_recording_time: int = 60,
+    binary_transport: bool = False,
+    transcription_scheduler: Optional["TranscriptionBatchScheduler"] = None,
     key: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
@@ -264,7 +698,8 @@ def multimodal_chat_input(
     enable_voice_input : bool
         Whether to enable voice input functionality
     voice_recognition_method : str
-        Voice recognition method: "web_speech" or "openai_whisper"
+        Voice recognition method: "web_speech", "openai_whisper" or "local".
+        "local" transcribes recordings through transcription_scheduler
     openai_api_key : str, optional
         OpenAI API key used only on the Python side when openai_whisper is selected.
         If not provided, will attempt to use OPENAI_API_KEY environment variable
@@ -272,6 +707,12 @@ def multimodal_chat_input(
         Voice recognition language (e.g., "ja-JP", "en-US")
     max_recording_time : int
         Maximum recording time in seconds
+    binary_transport : bool
+        Send file and audio contents as raw bytes instead of base64 text.
+        When enabled, each file's "data" is returned as bytes
+    transcription_scheduler : TranscriptionBatchScheduler, optional
+        Shared scheduler that transcribes recordings with a local engine.
+        Required when voice_recognition_method is "local"
     key : str, optional
         Unique key for the component
 
@@ -286,7 +727,7 @@ def multimodal_chat_input(
                     "name": str,            # File name
                     "type": str,            # MIME type
                     "size": int,            # File size in bytes
-                    "data": str             # base64 encoded file data
+                    "data": str             # base64 encoded file data (bytes if binary_transport)
                 }
             ],
             "audio_metadata": {             # Voice input metadata
@@ -305,6 +746,7 @@ def multimodal_chat_input(
         max_files=max_files,
         max_recording_time=max_recording_time,
         voice_recognition_method=voice_recognition_method,
+        transcription_scheduler=transcription_scheduler,
     )
 
     # Check for OpenAI API key from environment variable if not provided
@@ -319,23 +761,16 @@ def multimodal_chat_input(
     if key is None:
         key = "multimodal_chat_input_default"
 
-    # Key to track previous value
-    last_value_key = f"_last_multimodal_value_{key}"
-    transcription_result_key = _build_session_state_key(key, "transcription_result")
-    transcription_error_key = _build_session_state_key(key, "transcription_error")
-    transcription_feedback_id_key = _build_session_state_key(
-        key, "transcription_feedback_id"
-    )
-    processed_request_key = _build_session_state_key(key, "processed_transcription")
-    transcription_result = st.session_state.pop(transcription_result_key, None)
-    transcription_error = st.session_state.pop(transcription_error_key, None)
-    transcription_feedback_id = st.session_state.pop(
-        transcription_feedback_id_key, None
-    )
+    record = _get_component_session_state().mark_rendered(key, _get_run_marker())
+    (
+        transcription_result,
+        transcription_error,
+        transcription_feedback_id,
+    ) = _pop_transcription_feedback(record)
 
     # Always use st._bottom to fix to the bottom of the screen
     with st._bottom:
-        component_value = _component_func(
+        component_value = _get_component_func()(
             placeholder=placeholder,
             max_chars=max_chars,
             disabled=disabled,
@@ -346,6 +781,7 @@ def multimodal_chat_input(
             voice_recognition_method=voice_recognition_method,
             voice_language=voice_language,
             max_recording_time=max_recording_time,
+            binary_transport=binary_transport,
             transcription_result=transcription_result,
             transcription_error=transcription_error,
             transcription_feedback_id=transcription_feedback_id,
@@ -353,62 +789,72 @@ def multimodal_chat_input(
             default=None,
         )
 
+    if isinstance(component_value, bytes):
+        # A binary value is consumed on the first run it is seen: it is either
+        # returned once or turned into transcription feedback. Later reruns
+        # with the same payload skip copying its parts again.
+        binary_value_key = _get_binary_value_key(component_value)
+        if binary_value_key is not None and (
+            binary_value_key == record.last_binary_value_key
+        ):
+            return None
+
+        record.last_binary_value_key = binary_value_key
+        try:
+            component_value = _decode_binary_value(component_value)
+        except ValueError:
+            _LOGGER.warning("Discarding invalid binary component value")
+            return None
+
     transcription_request = _get_transcription_request(component_value)
-    if transcription_request is not None:
-        request_fingerprint = _get_transcription_request_fingerprint(
-            transcription_request
+    if transcription_request is None:
+        record.fallback_fingerprint_cache = None
+    else:
+        request_fingerprint = _get_cached_transcription_request_fingerprint(
+            record, transcription_request
         )
-        processed_request = st.session_state.get(processed_request_key)
-
-        if processed_request == request_fingerprint:
+        if record.processed_request == request_fingerprint:
             return None
 
-        if voice_recognition_method != "openai_whisper":
+        if voice_recognition_method == "web_speech":
             _set_transcription_feedback(
-                processed_request_key=processed_request_key,
-                request_fingerprint=request_fingerprint,
-                transcription_result_key=transcription_result_key,
-                transcription_error_key=transcription_error_key,
-                transcription_feedback_id_key=transcription_feedback_id_key,
+                record,
+                request_fingerprint,
                 transcription_error=_TRANSCRIPTION_NOT_AVAILABLE_MESSAGE,
             )
             st.rerun()
 
-        if not openai_api_key:
+        if voice_recognition_method == "openai_whisper" and not openai_api_key:
             _set_transcription_feedback(
-                processed_request_key=processed_request_key,
-                request_fingerprint=request_fingerprint,
-                transcription_result_key=transcription_result_key,
-                transcription_error_key=transcription_error_key,
-                transcription_feedback_id_key=transcription_feedback_id_key,
+                record,
+                request_fingerprint,
                 transcription_error=_TRANSCRIPTION_NOT_AVAILABLE_MESSAGE,
             )
             st.rerun()
 
         try:
+            audio_data = transcription_request.get("audio_data", "")
             transcription_text = _transcribe_audio(
-                audio_data=str(transcription_request.get("audio_data", "")),
+                audio_data=(
+                    audio_data if isinstance(audio_data, bytes) else str(audio_data)
+                ),
                 language=str(transcription_request.get("language", voice_language)),
                 openai_api_key=openai_api_key,
+                mime_type=str(transcription_request.get("mime_type", "audio/webm")),
+                transcription_scheduler=transcription_scheduler,
             )
         except Exception as exc:
             _LOGGER.exception("Voice transcription failed")
             _set_transcription_feedback(
-                processed_request_key=processed_request_key,
-                request_fingerprint=request_fingerprint,
-                transcription_result_key=transcription_result_key,
-                transcription_error_key=transcription_error_key,
-                transcription_feedback_id_key=transcription_feedback_id_key,
+                record,
+                request_fingerprint,
                 transcription_error=_get_transcription_error_message(exc),
             )
             st.rerun()
 
         _set_transcription_feedback(
-            processed_request_key=processed_request_key,
-            request_fingerprint=request_fingerprint,
-            transcription_result_key=transcription_result_key,
-            transcription_error_key=transcription_error_key,
-            transcription_feedback_id_key=transcription_feedback_id_key,
+            record,
+            request_fingerprint,
             transcription_result=transcription_text,
         )
         st.rerun()
@@ -416,11 +862,11 @@ def multimodal_chat_input(
     # Return the value only once when it changes
     if component_value is not None:
         # Compare with previous value (including timestamp to allow duplicate content)
-        last_value = st.session_state.get(last_value_key, None)
+        value_id = _get_value_identity(component_value)
 
         # Return only when value has changed (timestamp ensures uniqueness)
-        if component_value != last_value:
-            st.session_state[last_value_key] = component_value
+        if value_id != record.last_value_id:
+            record.last_value_id = value_id
 
             # Remove internal timestamp before returning to user
             result: Dict[str, Any] = component_value.copy()
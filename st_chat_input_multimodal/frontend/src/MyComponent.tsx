@@ -3,7 +3,7 @@ import {
   withStreamlitConnection,
   ComponentProps,
 } from "streamlit-component-lib"
-import React, { useEffect, useState, useCallback, KeyboardEvent, ChangeEvent } from "react"
+import React, { lazy, Suspense, useRef, useState, useCallback, KeyboardEvent, ChangeEvent } from "react"
 
 import {
   DEFAULT_ACCEPTED_FILE_TYPES,
@@ -14,22 +14,32 @@ import {
   SEND_BUTTON_ICON,
   DEFAULT_VOICE_LANGUAGE,
   DEFAULT_VOICE_RECOGNITION_METHOD,
-  FRAME_HEIGHT,
+  INITIAL_VOICE_INPUT_STATE,
 } from './constants'
-import { ComponentArgs, ComponentResult, ErrorState, RawComponentArgs } from './types'
+import {
+  ComponentArgs,
+  ComponentResult,
+  ErrorState,
+  RawComponentArgs,
+  VoiceInputHandle,
+  VoiceInputState,
+} from './types'
 import { ErrorMessage } from './components/ErrorMessage'
+import { encodeBinaryValue } from './utils/binaryUtils'
 
 // Import hooks
 import { useFileUpload } from './hooks/useFileUpload'
-import { useVoiceRecording } from './hooks/useVoiceRecording'
+import { useFrameHeight } from './hooks/useFrameHeight'
 import { useStyles } from './hooks/useStyles'
 
 // Import components
 import { FilePreview } from './components/FilePreview'
 import { FileUploadButton } from './components/FileUploadButton'
-import { VoiceButton } from './components/VoiceButton'
 import { TextInput } from './components/TextInput'
 
+// Voice input is loaded on demand so its code is only fetched when enabled
+const VoiceInput = lazy(() => import('./components/VoiceInput'))
+
 const normalizeComponentArgs = (rawArgs: RawComponentArgs): ComponentArgs => ({
   placeholder: rawArgs.placeholder,
   maxChars: rawArgs.max_chars,
@@ -40,6 +50,7 @@ const normalizeComponentArgs = (rawArgs: RawComponentArgs): ComponentArgs => ({
   voiceRecognitionMethod: rawArgs.voice_recognition_method,
   voiceLanguage: rawArgs.voice_language,
   maxRecordingTime: rawArgs.max_recording_time,
+  binaryTransport: rawArgs.binary_transport,
   transcriptionResult: rawArgs.transcription_result,
   transcriptionError: rawArgs.transcription_error,
   transcriptionFeedbackId: rawArgs.transcription_feedback_id,
@@ -67,6 +78,7 @@ function MultimodalChatInput({
     voiceRecognitionMethod = DEFAULT_VOICE_RECOGNITION_METHOD,
     voiceLanguage = DEFAULT_VOICE_LANGUAGE,
     maxRecordingTime = DEFAULT_MAX_RECORDING_TIME,
+    binaryTransport = false,
     transcriptionResult,
     transcriptionError,
     transcriptionFeedbackId,
@@ -76,9 +88,11 @@ function MultimodalChatInput({
   const [inputText, setInputText] = useState<string>("")
   const [isFocused, setIsFocused] = useState<boolean>(false)
   const [error, setError] = useState<ErrorState | null>(null)
-  const [textAreaHeight, setTextAreaHeight] = useState<number>(FRAME_HEIGHT.minTextArea)
-  const [frameHeightUpdateTimer, setFrameHeightUpdateTimer] = useState<number | null>(null)
-  const [lastFrameHeight, setLastFrameHeight] = useState<number>(0) // 前回のフレーム高さを記録
+  const [voiceState, setVoiceState] = useState<VoiceInputState>(INITIAL_VOICE_INPUT_STATE)
+  const voiceInputRef = useRef<VoiceInputHandle>(null)
+  const containerRef = useRef<HTMLDivElement>(null)
+
+  useFrameHeight(containerRef)
 
   const clearError = useCallback(() => {
     setError(null)
@@ -96,6 +110,7 @@ function MultimodalChatInput({
   // File upload hook
   const {
     uploadedFiles,
+    pendingFiles,
     isDragOver,
     fileInputRef,
     handleFileButtonClick,
@@ -105,100 +120,42 @@ function MultimodalChatInput({
     handleDrop,
     handlePaste,
     handleRemoveFile,
+    handleCancelPendingFile,
     clearFiles
   } = useFileUpload({
     acceptedFileTypes,
     maxFileSizeMb,
     maxFiles,
+    binaryTransport,
     onError: handleError,
     onClearError: clearError,
   })
 
-  // Voice recording hook
-  const voiceHook = useVoiceRecording({
-    voiceRecognitionMethod,
-    voiceLanguage,
-    maxRecordingTime,
-    transcriptionResult,
-    transcriptionError,
-    transcriptionFeedbackId,
-    onTextUpdate: handleVoiceTextUpdate,
-    onError: handleError,
-    onClearError: clearError,
-  })
+  const clearAudioMetadata = useCallback(() => {
+    voiceInputRef.current?.clearAudioMetadata()
+  }, [])
+
   const hasContent = inputText.trim().length > 0 || uploadedFiles.length > 0
   const isSubmitDisabled =
-    !hasContent || disabled || voiceHook.isRecording || voiceHook.isTranscribing
+    !hasContent ||
+    disabled ||
+    pendingFiles.length > 0 ||
+    voiceState.isRecording ||
+    voiceState.isTranscribing
 
   // Styles hook
   const getStyles = useStyles(theme, {
     isFocused,
     isDragOver,
-    isRecording: voiceHook.isRecording,
-    isTranscribing: voiceHook.isTranscribing,
+    isRecording: voiceState.isRecording,
+    isTranscribing: voiceState.isTranscribing,
     hasContent,
     disabled: disabled || false,
-    uploadedFilesLength: uploadedFiles.length
+    uploadedFilesLength: uploadedFiles.length + pendingFiles.length
   })
 
   const styles = getStyles() || {}
 
-  /**
-   * Update frame height when dependencies change with debounce
-   */
-  useEffect(() => {
-    // 既存のタイマーをクリア
-    if (frameHeightUpdateTimer) {
-      window.clearTimeout(frameHeightUpdateTimer)
-    }
-
-    // 新しいタイマーを設定（デバウンス）
-    const timer = window.setTimeout(() => {
-      // 基本の高さ
-      const baseHeight = FRAME_HEIGHT.base
-      const filePreviewHeight = uploadedFiles.length > 0
-        ? uploadedFiles.length * FRAME_HEIGHT.filePreviewItem + FRAME_HEIGHT.filePreviewOffset
-        : 0
-      
-      // テキストエリアの高さを最大値で制限
-      const actualTextAreaHeight = Math.min(textAreaHeight, FRAME_HEIGHT.maxTextArea)
-      
-      // フレーム高さを計算（最大値を設定して一定以上大きくならないようにする）
-      const totalHeight = baseHeight + filePreviewHeight + actualTextAreaHeight
-      
-      // フレーム高さを設定（安定化のため小さな調整を加える）
-      const finalHeight = Math.min(totalHeight, FRAME_HEIGHT.maxFrame)
-      
-      // 前回の高さと比較して、変更があった場合のみ更新
-      if (Math.abs(finalHeight - lastFrameHeight) > FRAME_HEIGHT.updateThreshold) {
-        setLastFrameHeight(finalHeight)
-        
-        // 高さが一定以上になった場合は固定値を使用（コンポーネントが上に動くのを防ぐ）
-        if (finalHeight >= FRAME_HEIGHT.maxFrame) {
-          Streamlit.setFrameHeight(FRAME_HEIGHT.maxFrame)
-        } else {
-          Streamlit.setFrameHeight(finalHeight)
-        }
-      }
-    }, FRAME_HEIGHT.debounceMs)
-
-    setFrameHeightUpdateTimer(timer)
-
-    // クリーンアップ
-    return () => {
-      if (timer) {
-        window.clearTimeout(timer)
-      }
-    }
-  }, [uploadedFiles, textAreaHeight, lastFrameHeight])
-
-  /**
-   * Text area height change handler
-   */
-  const handleTextAreaHeightChange = useCallback((height: number) => {
-    setTextAreaHeight(height)
-  }, [])
-
   /**
    * Text input value change handler
    */
@@ -224,28 +181,18 @@ function MultimodalChatInput({
     const result: ComponentResult = {
       text: inputText.trim(),
       files: uploadedFiles,
-      audio_metadata: voiceHook.audioMetadata,
+      audio_metadata: voiceState.audioMetadata,
       _timestamp: Date.now(), // Add unique timestamp for each submission
     }
     
-    Streamlit.setComponentValue(result)
+    Streamlit.setComponentValue(binaryTransport ? encodeBinaryValue(result) : result)
     
     // Clear input
     setInputText("")
     clearFiles()
     clearError()
-    voiceHook.clearAudioMetadata()
-    
-    // 高さを確実にリセット
-    setTextAreaHeight(FRAME_HEIGHT.minTextArea)
-    setLastFrameHeight(0) // 前回の高さ記録もリセット
-    
-    // フレーム高さを基本の高さに戻す
-    window.setTimeout(() => {
-      const minFrameHeight = FRAME_HEIGHT.base + FRAME_HEIGHT.minTextArea
-      Streamlit.setFrameHeight(minFrameHeight)
-    }, FRAME_HEIGHT.resetDelayMs)
-  }, [inputText, uploadedFiles, voiceHook.audioMetadata, isSubmitDisabled, clearError, clearFiles, voiceHook.clearAudioMetadata])
+    clearAudioMetadata()
+  }, [inputText, uploadedFiles, voiceState.audioMetadata, binaryTransport, isSubmitDisabled, clearError, clearFiles, clearAudioMetadata])
 
   /**
    * Keyboard event handler (Enter to send)
@@ -271,19 +218,21 @@ function MultimodalChatInput({
    * Get placeholder text based on state
    */
   const getPlaceholder = (): string => {
-    if (voiceHook.isRecording) return "Recording..."
-    if (voiceHook.isTranscribing) return "Transcribing..."
+    if (voiceState.isRecording) return "Recording..."
+    if (voiceState.isTranscribing) return "Transcribing..."
     return placeholder
   }
 
   return (
-    <div style={styles.outerContainer}>
+    <div ref={containerRef} style={styles.outerContainer}>
       <ErrorMessage error={error} onDismiss={clearError} />
 
       {/* File preview area */}
       <FilePreview
         files={uploadedFiles}
+        pendingFiles={pendingFiles}
         onRemoveFile={handleRemoveFile}
+        onCancelPendingFile={handleCancelPendingFile}
         styles={{
           filePreviewContainer: styles.filePreviewContainer,
           filePreview: styles.filePreview,
@@ -320,17 +269,27 @@ function MultimodalChatInput({
 
         {/* Voice button */}
         {enableVoiceInput && (
-          <VoiceButton
-            isRecording={voiceHook.isRecording}
-            isTranscribing={voiceHook.isTranscribing}
-            recordingTime={voiceHook.formatRecordingTime()}
-            onVoiceButtonClick={voiceHook.handleVoiceButtonClick}
-            disabled={disabled || false}
-            styles={{
-              voiceButton: styles.voiceButton,
-              recordingStatus: styles.recordingStatus
-            }}
-          />
+          <Suspense fallback={null}>
+            <VoiceInput
+              ref={voiceInputRef}
+              voiceRecognitionMethod={voiceRecognitionMethod}
+              voiceLanguage={voiceLanguage}
+              maxRecordingTime={maxRecordingTime}
+              binaryTransport={binaryTransport}
+              transcriptionResult={transcriptionResult}
+              transcriptionError={transcriptionError}
+              transcriptionFeedbackId={transcriptionFeedbackId}
+              onTextUpdate={handleVoiceTextUpdate}
+              onError={handleError}
+              onClearError={clearError}
+              onStateChange={setVoiceState}
+              disabled={disabled || false}
+              styles={{
+                voiceButton: styles.voiceButton,
+                recordingStatus: styles.recordingStatus
+              }}
+            />
+          </Suspense>
         )}
 
         {/* Text input */}
@@ -342,10 +301,9 @@ function MultimodalChatInput({
           onBlur={handleBlur}
           onPaste={handlePaste}
           placeholder={getPlaceholder()}
-          disabled={disabled || voiceHook.isRecording || voiceHook.isTranscribing}
+          disabled={disabled || voiceState.isRecording || voiceState.isTranscribing}
           maxChars={maxChars}
           style={styles.textArea}
-          onHeightChange={handleTextAreaHeightChange}
         />
         
         {/* Send button */}
@@ -1,10 +1,12 @@
 import React from 'react'
-import { FileData } from '../types'
+import { FileData, PendingFile } from '../types'
 import { formatFileSize, sanitizeFileName } from '../utils/fileUtils'
 
 interface FilePreviewProps {
   files: FileData[]
+  pendingFiles?: PendingFile[]
   onRemoveFile: (index: number) => void
+  onCancelPendingFile?: (id: number) => void
   styles: {
     filePreviewContainer: React.CSSProperties
     filePreview: React.CSSProperties
@@ -17,10 +19,12 @@ interface FilePreviewProps {
 
 export const FilePreview: React.FC<FilePreviewProps> = ({
   files,
+  pendingFiles = [],
   onRemoveFile,
+  onCancelPendingFile,
   styles
 }) => {
-  if (files.length === 0) return null
+  if (files.length === 0 && pendingFiles.length === 0) return null
 
   return (
     <div style={styles.filePreviewContainer}>
@@ -43,6 +47,23 @@ export const FilePreview: React.FC<FilePreviewProps> = ({
           </div>
         )
       })}
+      {pendingFiles.map((pendingFile) => (
+        <div key={`pending-${pendingFile.id}`} style={styles.filePreview}>
+          <div style={styles.fileInfo}>
+            <div style={styles.fileName}>⏳ {sanitizeFileName(pendingFile.name)}</div>
+            <div style={styles.fileSize}>
+              Loading {pendingFile.progress}% of {formatFileSize(pendingFile.size)}
+            </div>
+          </div>
+          <button
+            onClick={() => onCancelPendingFile?.(pendingFile.id)}
+            style={styles.removeButton}
+            title="Cancel upload"
+          >
+            ×
+          </button>
+        </div>
+      ))}
     </div>
   )
 }
@@ -1,4 +1,5 @@
 import React, { useRef, useEffect, KeyboardEvent, ChangeEvent, ClipboardEvent } from 'react'
+import { FRAME_HEIGHT } from '../constants'
 
 interface TextInputProps {
   value: string
@@ -11,7 +12,6 @@ interface TextInputProps {
   disabled: boolean
   maxChars?: number
   style: React.CSSProperties
-  onHeightChange?: (height: number) => void
 }
 
 export const TextInput: React.FC<TextInputProps> = ({
@@ -24,8 +24,7 @@ export const TextInput: React.FC<TextInputProps> = ({
   placeholder,
   disabled,
   maxChars,
-  style,
-  onHeightChange
+  style
 }) => {
   const textareaRef = useRef<HTMLTextAreaElement>(null)
 
@@ -39,16 +38,13 @@ export const TextInput: React.FC<TextInputProps> = ({
   // 高さ自動調整
   useEffect(() => {
     if (textareaRef.current) {
-      const maxHeight = 320 // useStyles.tsの設定と同じ
-      const minHeight = 46 // 最小高さ
+      const maxHeight = FRAME_HEIGHT.maxTextArea
+      const minHeight = FRAME_HEIGHT.minTextArea
 
       // テキストが空の場合は最小高さに戻す
       if (value === '') {
         textareaRef.current.style.height = `${minHeight}px`
         textareaRef.current.style.overflowY = 'hidden'
-        if (onHeightChange) {
-          onHeightChange(minHeight)
-        }
         return
       }
 
@@ -61,23 +57,13 @@ export const TextInput: React.FC<TextInputProps> = ({
       if (scrollHeight > maxHeight) {
         textareaRef.current.style.height = `${maxHeight}px`
         textareaRef.current.style.overflowY = 'auto'
-
-        // 最大高さに達した場合は固定値を報告
-        if (onHeightChange) {
-          onHeightChange(maxHeight)
-        }
       } else {
         const actualHeight = Math.max(scrollHeight, minHeight)
         textareaRef.current.style.height = `${actualHeight}px`
         textareaRef.current.style.overflowY = 'hidden'
-
-        // 実際の高さを報告
-        if (onHeightChange) {
-          onHeightChange(actualHeight)
-        }
       }
     }
-  }, [value, onHeightChange])
+  }, [value])
 
   return (
     <>
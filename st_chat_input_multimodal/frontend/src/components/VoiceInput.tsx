@@ -0,0 +1,70 @@
+import React, { forwardRef, useEffect, useImperativeHandle } from 'react'
+import {
+  ErrorState,
+  VoiceInputHandle,
+  VoiceInputState,
+  VoiceRecognitionMethod,
+} from '../types'
+import { INITIAL_VOICE_INPUT_STATE } from '../constants'
+import { useVoiceRecording } from '../hooks/useVoiceRecording'
+import { VoiceButton } from './VoiceButton'
+
+interface VoiceInputProps {
+  voiceRecognitionMethod: VoiceRecognitionMethod
+  voiceLanguage: string
+  maxRecordingTime: number
+  binaryTransport: boolean
+  transcriptionResult?: string
+  transcriptionError?: string
+  transcriptionFeedbackId?: string
+  onTextUpdate: (text: string) => void
+  onError?: (error: ErrorState) => void
+  onClearError?: () => void
+  onStateChange: (state: VoiceInputState) => void
+  disabled: boolean
+  styles: {
+    voiceButton: React.CSSProperties
+    recordingStatus: React.CSSProperties
+  }
+}
+
+/**
+ * Voice input button together with its recording logic
+ *
+ * Loaded on demand so the recording and Web Speech code is only fetched
+ * when voice input is enabled
+ */
+const VoiceInput = forwardRef<VoiceInputHandle, VoiceInputProps>(({
+  onStateChange,
+  disabled,
+  styles,
+  ...voiceRecordingProps
+}, ref) => {
+  const voiceHook = useVoiceRecording(voiceRecordingProps)
+  const { isRecording, isTranscribing, audioMetadata, clearAudioMetadata } = voiceHook
+
+  useImperativeHandle(ref, () => ({ clearAudioMetadata }), [clearAudioMetadata])
+
+  useEffect(() => {
+    onStateChange({ isRecording, isTranscribing, audioMetadata })
+  }, [isRecording, isTranscribing, audioMetadata, onStateChange])
+
+  useEffect(() => {
+    return () => onStateChange(INITIAL_VOICE_INPUT_STATE)
+  }, [onStateChange])
+
+  return (
+    <VoiceButton
+      isRecording={isRecording}
+      isTranscribing={isTranscribing}
+      recordingTime={voiceHook.formatRecordingTime()}
+      onVoiceButtonClick={voiceHook.handleVoiceButtonClick}
+      disabled={disabled}
+      styles={styles}
+    />
+  )
+})
+
+VoiceInput.displayName = 'VoiceInput'
+
+export default VoiceInput
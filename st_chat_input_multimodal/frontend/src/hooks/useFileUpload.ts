@@ -1,12 +1,13 @@
-import { useState, useRef, useCallback, DragEvent, ChangeEvent, ClipboardEvent } from 'react'
-import { ErrorState, FileData } from '../types'
-import { processFiles } from '../utils/fileUtils'
-import { createErrorState } from '../utils/errorUtils'
+import { useState, useRef, useCallback, useEffect, DragEvent, ChangeEvent, ClipboardEvent } from 'react'
+import { ErrorState, FileData, PendingFile } from '../types'
+import { processFile } from '../utils/fileUtils'
+import { createErrorState, isAbortError, logError } from '../utils/errorUtils'
 
 interface UseFileUploadProps {
   acceptedFileTypes: string[]
   maxFileSizeMb: number
   maxFiles?: number
+  binaryTransport?: boolean
   onError?: (error: ErrorState) => void
   onClearError?: () => void
 }
@@ -15,12 +16,28 @@ export const useFileUpload = ({
   acceptedFileTypes,
   maxFileSizeMb,
   maxFiles,
+  binaryTransport = false,
   onError,
   onClearError,
 }: UseFileUploadProps) => {
   const [uploadedFiles, setUploadedFiles] = useState<FileData[]>([])
+  const [pendingFiles, setPendingFiles] = useState<PendingFile[]>([])
   const [isDragOver, setIsDragOver] = useState<boolean>(false)
   const fileInputRef = useRef<HTMLInputElement>(null)
+  // Uploaded files plus slots reserved by in-flight ingestion. Updated
+  // synchronously so overlapping drops and pastes never exceed maxFiles.
+  const occupiedSlotsRef = useRef<number>(0)
+  const pendingControllersRef = useRef(new Map<number, AbortController>())
+  const nextPendingIdRef = useRef<number>(0)
+
+  useEffect(() => {
+    const pendingControllers = pendingControllersRef.current
+
+    return () => {
+      pendingControllers.forEach(controller => controller.abort())
+      pendingControllers.clear()
+    }
+  }, [])
 
   const reportError = useCallback((
     message: string,
@@ -29,6 +46,22 @@ export const useFileUpload = ({
     onError?.(createErrorState(message, type))
   }, [onError])
 
+  const updatePendingProgress = useCallback((id: number, progress: number) => {
+    const percent = Math.floor(progress * 100)
+
+    setPendingFiles(prev => {
+      const pendingFile = prev.find(file => file.id === id)
+      if (!pendingFile || pendingFile.progress === percent) {
+        return prev
+      }
+
+      return prev.map(file => file.id === id ? { ...file, progress: percent } : file)
+    })
+  }, [])
+
+  /**
+   * Validate and read files one by one, adding each as soon as it is ready
+   */
   const addFiles = useCallback(async (files: FileList | File[]) => {
     const fileArray = Array.from(files)
 
@@ -41,7 +74,7 @@ export const useFileUpload = ({
     let filesToProcess = fileArray
 
     if (maxFiles !== undefined) {
-      const remainingSlots = maxFiles - uploadedFiles.length
+      const remainingSlots = maxFiles - occupiedSlotsRef.current
 
       if (remainingSlots <= 0) {
         reportError(`File limit reached. Maximum ${maxFiles} files allowed.`, 'warning')
@@ -57,14 +90,56 @@ export const useFileUpload = ({
       }
     }
 
-    const newFiles = await processFiles(
-      filesToProcess,
-      acceptedFileTypes,
-      maxFileSizeMb,
-      (message) => reportError(message)
-    )
-    setUploadedFiles(prev => [...prev, ...newFiles])
-  }, [acceptedFileTypes, maxFileSizeMb, maxFiles, onClearError, reportError, uploadedFiles.length])
+    // Reserve slots before the first await
+    occupiedSlotsRef.current += filesToProcess.length
+
+    const pending = filesToProcess.map(file => {
+      const id = nextPendingIdRef.current++
+      pendingControllersRef.current.set(id, new AbortController())
+      return { id, file }
+    })
+    setPendingFiles(prev => [
+      ...prev,
+      ...pending.map(({ id, file }) => ({ id, name: file.name, size: file.size, progress: 0 })),
+    ])
+
+    for (const { id, file } of pending) {
+      const controller = pendingControllersRef.current.get(id)
+      if (!controller) {
+        // Cancelled before processing started; its slot is already released
+        continue
+      }
+
+      let fileData: FileData | null = null
+
+      try {
+        fileData = await processFile(file, acceptedFileTypes, maxFileSizeMb, {
+          binaryTransport,
+          signal: controller.signal,
+          onError: (message) => reportError(message),
+          onProgress: (progress) => updatePendingProgress(id, progress),
+        })
+      } catch (error) {
+        if (!isAbortError(error)) {
+          logError('File processing error', error)
+        }
+      }
+
+      if (controller.signal.aborted) {
+        continue
+      }
+
+      pendingControllersRef.current.delete(id)
+      setPendingFiles(prev => prev.filter(pendingFile => pendingFile.id !== id))
+
+      if (fileData) {
+        const acceptedFile = fileData
+        setUploadedFiles(prev => [...prev, acceptedFile])
+      } else {
+        occupiedSlotsRef.current -= 1
+      }
+    }
+  }, [acceptedFileTypes, maxFileSizeMb, maxFiles, binaryTransport, onClearError, reportError, updatePendingProgress])
 
   /**
    * + button click - open file explorer
@@ -143,18 +218,39 @@ export const useFileUpload = ({
    * File removal handler
    */
   const handleRemoveFile = useCallback((index: number) => {
+    occupiedSlotsRef.current -= 1
     setUploadedFiles(prev => prev.filter((_, i) => i !== index))
   }, [])
 
   /**
-   * Clear all files
+   * Cancel a file that is still being read
+   */
+  const handleCancelPendingFile = useCallback((id: number) => {
+    const controller = pendingControllersRef.current.get(id)
+    if (!controller) {
+      return
+    }
+
+    controller.abort()
+    pendingControllersRef.current.delete(id)
+    occupiedSlotsRef.current -= 1
+    setPendingFiles(prev => prev.filter(pendingFile => pendingFile.id !== id))
+  }, [])
+
+  /**
+   * Clear all files, cancelling any that are still being read
    */
   const clearFiles = useCallback(() => {
+    pendingControllersRef.current.forEach(controller => controller.abort())
+    pendingControllersRef.current.clear()
+    occupiedSlotsRef.current = 0
+    setPendingFiles([])
     setUploadedFiles([])
   }, [])
 
   return {
     uploadedFiles,
+    pendingFiles,
     isDragOver,
     fileInputRef,
     handleFileButtonClick,
@@ -164,7 +260,7 @@ export const useFileUpload = ({
     handleDrop,
     handlePaste,
     handleRemoveFile,
-    clearFiles,
-    setUploadedFiles
+    handleCancelPendingFile,
+    clearFiles
   }
 } 
@@ -0,0 +1,68 @@
+import { useCallback, useEffect, useRef, RefObject } from 'react'
+import { Streamlit } from 'streamlit-component-lib'
+import { FRAME_HEIGHT } from '../constants'
+
+/**
+ * Keep the iframe height in sync with the measured height of an element
+ *
+ * Size changes are observed with ResizeObserver and coalesced into at most
+ * one Streamlit.setFrameHeight call per animation frame. Growth is applied
+ * immediately so content is never clipped, while shrinking is ignored until
+ * it exceeds FRAME_HEIGHT.updateThreshold to avoid layout thrash.
+ */
+export const useFrameHeight = (targetRef: RefObject<HTMLElement>) => {
+  const animationFrameRef = useRef<number | null>(null)
+  const lastFrameHeightRef = useRef<number>(0)
+
+  const updateFrameHeight = useCallback(() => {
+    animationFrameRef.current = null
+
+    const element = targetRef.current
+    if (!element) {
+      return
+    }
+
+    const measuredHeight = Math.ceil(element.getBoundingClientRect().height)
+    const frameHeight = Math.min(measuredHeight, FRAME_HEIGHT.maxFrame)
+    const lastFrameHeight = lastFrameHeightRef.current
+
+    if (frameHeight === lastFrameHeight) {
+      return
+    }
+
+    if (frameHeight < lastFrameHeight && lastFrameHeight - frameHeight <= FRAME_HEIGHT.updateThreshold) {
+      return
+    }
+
+    lastFrameHeightRef.current = frameHeight
+    Streamlit.setFrameHeight(frameHeight)
+  }, [targetRef])
+
+  const scheduleFrameHeightUpdate = useCallback(() => {
+    if (animationFrameRef.current !== null) {
+      return
+    }
+
+    animationFrameRef.current = window.requestAnimationFrame(updateFrameHeight)
+  }, [updateFrameHeight])
+
+  useEffect(() => {
+    const element = targetRef.current
+    if (!element) {
+      return
+    }
+
+    const observer = new ResizeObserver(scheduleFrameHeightUpdate)
+    observer.observe(element)
+    scheduleFrameHeightUpdate()
+
+    return () => {
+      observer.disconnect()
+
+      if (animationFrameRef.current !== null) {
+        window.cancelAnimationFrame(animationFrameRef.current)
+        animationFrameRef.current = null
+      }
+    }
+  }, [targetRef, scheduleFrameHeightUpdate])
+}
@@ -20,6 +20,7 @@ interface UseVoiceRecordingProps {
   voiceRecognitionMethod: VoiceRecognitionMethod
   voiceLanguage: string
   maxRecordingTime: number
+  binaryTransport?: boolean
   transcriptionResult?: string
   transcriptionError?: string
   transcriptionFeedbackId?: string
@@ -48,6 +49,7 @@ export const useVoiceRecording = ({
   voiceRecognitionMethod,
   voiceLanguage,
   maxRecordingTime,
+  binaryTransport = false,
   transcriptionResult,
   transcriptionError,
   transcriptionFeedbackId,
@@ -108,7 +110,7 @@ export const useVoiceRecording = ({
       onTextUpdate(transcriptionResult)
       setAudioMetadata({
         used_voice_input: true,
-        transcription_method: 'openai_whisper',
+        transcription_method: voiceRecognitionMethod,
         recording_duration: lastRecordingDurationRef.current,
         language: voiceLanguage
       })
@@ -119,6 +121,7 @@ export const useVoiceRecording = ({
     transcriptionFeedbackId,
     transcriptionResult,
     transcriptionError,
+    voiceRecognitionMethod,
     voiceLanguage,
     onTextUpdate,
     onClearError,
@@ -332,7 +335,7 @@ export const useVoiceRecording = ({
    * Handle recording completion
    */
   const handleRecordingComplete = useCallback(async (mimeType?: string) => {
-    if (voiceRecognitionMethod !== "openai_whisper" || audioChunksRef.current.length === 0) {
+    if (voiceRecognitionMethod === "web_speech" || audioChunksRef.current.length === 0) {
       clearAudioChunks()
       return
     }
@@ -344,7 +347,8 @@ export const useVoiceRecording = ({
       await sendAudioForTranscription(
         audioChunks,
         voiceLanguage,
-        mimeType
+        mimeType,
+        binaryTransport
       )
 
       clearAudioChunks()
@@ -355,7 +359,7 @@ export const useVoiceRecording = ({
       logError('Audio transcription request error', error)
       reportError('Transcription failed. Please try again.')
     }
-  }, [clearAudioChunks, voiceRecognitionMethod, voiceLanguage, reportError])
+  }, [clearAudioChunks, voiceRecognitionMethod, voiceLanguage, binaryTransport, reportError])
 
   /**
    * Start voice recording
@@ -1,4 +1,4 @@
-export type VoiceRecognitionMethod = 'web_speech' | 'openai_whisper'
+export type VoiceRecognitionMethod = 'web_speech' | 'openai_whisper' | 'local'
 
 export interface SpeechRecognitionAlternativeLike {
   transcript: string
@@ -52,7 +52,14 @@ export interface FileData {
   name: string
   type: string
   size: number
-  data: string
+  data: string | Uint8Array
+}
+
+export interface PendingFile {
+  id: number
+  name: string
+  size: number
+  progress: number
 }
 
 export interface AudioMetadata {
@@ -63,6 +70,16 @@ export interface AudioMetadata {
   language: string
 }
 
+export interface VoiceInputState {
+  isRecording: boolean
+  isTranscribing: boolean
+  audioMetadata: AudioMetadata | null
+}
+
+export interface VoiceInputHandle {
+  clearAudioMetadata: () => void
+}
+
 export interface ErrorState {
   message: string | null
   type: 'error' | 'warning'
@@ -70,9 +87,12 @@ export interface ErrorState {
 
 export interface TranscriptionRequest {
   type: 'transcription_request'
-  audio_data: string
+  audio_data: string | Uint8Array
+  audio_size: number
+  audio_digest: string
+  mime_type?: string
   language: string
-  request_id: number
+  request_id: string
 }
 
 export interface RawComponentArgs {
@@ -85,6 +105,7 @@ export interface RawComponentArgs {
   voice_recognition_method?: VoiceRecognitionMethod
   voice_language?: string
   max_recording_time?: number
+  binary_transport?: boolean
   transcription_result?: string
   transcription_error?: string
   transcription_feedback_id?: string
@@ -100,6 +121,7 @@ export interface ComponentArgs {
   voiceRecognitionMethod?: VoiceRecognitionMethod
   voiceLanguage?: string
   maxRecordingTime?: number
+  binaryTransport?: boolean
   transcriptionResult?: string
   transcriptionError?: string
   transcriptionFeedbackId?: string
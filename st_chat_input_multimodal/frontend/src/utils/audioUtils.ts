@@ -1,5 +1,6 @@
 import { Streamlit } from 'streamlit-component-lib'
 import type { SpeechRecognitionConstructor, TranscriptionRequest } from '../types'
+import { encodeBinaryValue } from './binaryUtils'
 
 /**
  * Format recording time in MM:SS format
@@ -24,6 +25,54 @@ export const getSpeechRecognition = (): SpeechRecognitionConstructor | null => {
   return window.SpeechRecognition || window.webkitSpeechRecognition || null
 }
 
+const AUDIO_DIGEST_SAMPLE_SIZE = 4096
+
+const CRC32_TABLE = (() => {
+  const table = new Uint32Array(256)
+  for (let index = 0; index < 256; index++) {
+    let crc = index
+    for (let bit = 0; bit < 8; bit++) {
+      crc = crc & 1 ? 0xedb88320 ^ (crc >>> 1) : crc >>> 1
+    }
+    table[index] = crc >>> 0
+  }
+  return table
+})()
+
+const updateCrc32 = (crc: number, bytes: Uint8Array): number => {
+  let value = ~crc >>> 0
+  for (let index = 0; index < bytes.length; index++) {
+    value = CRC32_TABLE[(value ^ bytes[index]) & 0xff] ^ (value >>> 8)
+  }
+  return ~value >>> 0
+}
+
+const toBytes = (sample: string | Uint8Array): Uint8Array =>
+  typeof sample === 'string' ? new TextEncoder().encode(sample) : sample
+
+/**
+ * Cheap content digest of an audio payload
+ *
+ * CRC-32 of the first and last AUDIO_DIGEST_SAMPLE_SIZE units, so the cost
+ * does not depend on the recording length. Verified on the Python side by
+ * `_get_audio_sample_digest`, which must stay in sync with this function.
+ */
+export const getAudioSampleDigest = (audioData: string | Uint8Array): string => {
+  const samples = audioData.length > 2 * AUDIO_DIGEST_SAMPLE_SIZE
+    ? [audioData.slice(0, AUDIO_DIGEST_SAMPLE_SIZE), audioData.slice(-AUDIO_DIGEST_SAMPLE_SIZE)]
+    : [audioData]
+
+  const digest = samples.reduce((crc: number, sample) => updateCrc32(crc, toBytes(sample)), 0)
+  return digest.toString(16).padStart(8, '0')
+}
+
+const createRequestId = (): string => {
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID()
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`
+}
+
 const blobToDataUrl = (blob: Blob): Promise<string> =>
   new Promise((resolve, reject) => {
     const reader = new FileReader()
@@ -47,18 +96,40 @@ const blobToDataUrl = (blob: Blob): Promise<string> =>
 export const sendAudioForTranscription = async (
   audioChunks: Blob[],
   language: string,
-  mimeType = 'audio/webm'
+  mimeType = 'audio/webm',
+  binaryTransport = false
 ): Promise<void> => {
   if (audioChunks.length === 0) {
     throw new Error('Audio data is empty')
   }
 
   const audioBlob = new Blob(audioChunks, { type: mimeType || 'audio/webm' })
+  const requestId = createRequestId()
+
+  if (binaryTransport) {
+    const audioData = new Uint8Array(await audioBlob.arrayBuffer())
+    const request: TranscriptionRequest = {
+      type: 'transcription_request',
+      audio_data: audioData,
+      audio_size: audioData.length,
+      audio_digest: getAudioSampleDigest(audioData),
+      mime_type: audioBlob.type,
+      language,
+      request_id: requestId,
+    }
+
+    Streamlit.setComponentValue(encodeBinaryValue(request))
+    return
+  }
+
+  const audioData = await blobToDataUrl(audioBlob)
   const request: TranscriptionRequest = {
     type: 'transcription_request',
-    audio_data: await blobToDataUrl(audioBlob),
+    audio_data: audioData,
+    audio_size: audioData.length,
+    audio_digest: getAudioSampleDigest(audioData),
     language,
-    request_id: Date.now(),
+    request_id: requestId,
   }
 
   Streamlit.setComponentValue(request)
@@ -0,0 +1,41 @@
+const HEADER_LENGTH_BYTES = 4
+const BINARY_PART_MARKER = '__binary_part__'
+
+/**
+ * Encode a value into a single binary payload for Streamlit
+ *
+ * Streamlit only transports bytes when the whole component value is binary,
+ * so every Uint8Array inside `value` is moved into a binary part and replaced
+ * by `{ "__binary_part__": index }` in a JSON header. Layout:
+ * 4-byte big-endian header length, UTF-8 JSON header, then the raw parts.
+ * Decoded on the Python side by `_decode_binary_value`.
+ */
+export const encodeBinaryValue = (value: unknown): Uint8Array => {
+  const parts: Uint8Array[] = []
+  const valueJson = JSON.stringify(value, (_key, item: unknown) => {
+    if (item instanceof Uint8Array) {
+      parts.push(item)
+      return { [BINARY_PART_MARKER]: parts.length - 1 }
+    }
+    return item
+  })
+  const partLengths = parts.map(part => part.byteLength)
+  const header = `{"value":${valueJson},"parts":${JSON.stringify(partLengths)}}`
+  const headerBytes = new TextEncoder().encode(header)
+  const totalLength = parts.reduce(
+    (length, part) => length + part.byteLength,
+    HEADER_LENGTH_BYTES + headerBytes.byteLength
+  )
+
+  const payload = new Uint8Array(totalLength)
+  new DataView(payload.buffer).setUint32(0, headerBytes.byteLength, false)
+  payload.set(headerBytes, HEADER_LENGTH_BYTES)
+
+  let offset = HEADER_LENGTH_BYTES + headerBytes.byteLength
+  for (const part of parts) {
+    payload.set(part, offset)
+    offset += part.byteLength
+  }
+
+  return payload
+}
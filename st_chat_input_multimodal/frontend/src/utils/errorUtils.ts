@@ -13,3 +13,9 @@ export const logError = (context: string, error: unknown): void => {
     console.error(`[${context}]`, error)
   }
 }
+
+export const createAbortError = (): DOMException =>
+  new DOMException('The operation was aborted.', 'AbortError')
+
+export const isAbortError = (error: unknown): boolean =>
+  error instanceof DOMException && error.name === 'AbortError'
@@ -1,5 +1,5 @@
 import { FileData } from '../types'
-import { logError } from './errorUtils'
+import { createAbortError, isAbortError, logError } from './errorUtils'
 
 const MAGIC_BYTE_READ_LENGTH = 12
 
@@ -103,18 +103,56 @@ export const validateFile = async (
   return null
 }
 
-/**
- * Convert file to base64
- */
-export const fileToBase64 = (file: File): Promise<string> => {
+export interface ReadFileOptions {
+  signal?: AbortSignal
+  onProgress?: (progress: number) => void
+}
+
+const readFile = (
+  file: File,
+  readAs: 'dataUrl' | 'arrayBuffer',
+  { signal, onProgress }: ReadFileOptions = {}
+): Promise<string | ArrayBuffer> => {
   return new Promise((resolve, reject) => {
+    if (signal?.aborted) {
+      reject(createAbortError())
+      return
+    }
+
     const reader = new FileReader()
-    reader.onload = () => resolve(reader.result as string)
-    reader.onerror = reject
-    reader.readAsDataURL(file)
+    const handleAbort = () => reader.abort()
+
+    signal?.addEventListener('abort', handleAbort, { once: true })
+    reader.onprogress = (event) => {
+      if (event.lengthComputable && event.total > 0) {
+        onProgress?.(event.loaded / event.total)
+      }
+    }
+    reader.onload = () => resolve(reader.result as string | ArrayBuffer)
+    reader.onerror = () => reject(reader.error)
+    reader.onabort = () => reject(createAbortError())
+    reader.onloadend = () => signal?.removeEventListener('abort', handleAbort)
+
+    if (readAs === 'arrayBuffer') {
+      reader.readAsArrayBuffer(file)
+    } else {
+      reader.readAsDataURL(file)
+    }
   })
 }
 
+/**
+ * Convert file to base64
+ */
+export const fileToBase64 = async (file: File, options?: ReadFileOptions): Promise<string> =>
+  await readFile(file, 'dataUrl', options) as string
+
+/**
+ * Read file contents as raw bytes (binary transport mode)
+ */
+export const fileToBytes = async (file: File, options?: ReadFileOptions): Promise<Uint8Array> =>
+  new Uint8Array(await readFile(file, 'arrayBuffer', options) as ArrayBuffer)
+
 /**
  * Convert file size to human-readable format
  */
@@ -126,38 +164,51 @@ export const formatFileSize = (bytes: number): string => {
   return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i]
 }
 
+export interface ProcessFileOptions extends ReadFileOptions {
+  binaryTransport?: boolean
+  onError?: (message: string) => void
+}
+
 /**
- * Process multiple files and convert to FileData array
+ * Validate a single file and convert it to FileData
+ *
+ * Returns null (after reporting through onError) when the file is rejected.
+ * Rejects with an AbortError when the signal is aborted.
  */
-export const processFiles = async (
-  files: FileList | File[],
+export const processFile = async (
+  file: File,
   acceptedFileTypes: string[],
   maxFileSizeMb: number,
-  onError?: (message: string) => void
-): Promise<FileData[]> => {
-  const fileArray = Array.from(files)
-  const newFiles: FileData[] = []
-
-  for (const file of fileArray) {
-    const error = await validateFile(file, acceptedFileTypes, maxFileSizeMb)
-    if (error) {
-      onError?.(error)
-      continue
-    }
+  { binaryTransport = false, onError, ...readOptions }: ProcessFileOptions = {}
+): Promise<FileData | null> => {
+  const error = await validateFile(file, acceptedFileTypes, maxFileSizeMb)
+  if (readOptions.signal?.aborted) {
+    throw createAbortError()
+  }
 
-    try {
-      const base64Data = await fileToBase64(file)
-      newFiles.push({
-        name: file.name,
-        type: file.type,
-        size: file.size,
-        data: base64Data
-      })
-    } catch (error) {
-      logError('File reading error', error)
-      onError?.(`Failed to read file "${sanitizeFileName(file.name)}".`)
-    }
+  if (error) {
+    onError?.(error)
+    return null
   }
 
-  return newFiles
+  try {
+    const data = binaryTransport
+      ? await fileToBytes(file, readOptions)
+      : await fileToBase64(file, readOptions)
+
+    return {
+      name: file.name,
+      type: file.type,
+      size: file.size,
+      data
+    }
+  } catch (error) {
+    if (isAbortError(error)) {
+      throw error
+    }
+
+    logError('File reading error', error)
+    onError?.(`Failed to read file "${sanitizeFileName(file.name)}".`)
+    return null
+  }
 }
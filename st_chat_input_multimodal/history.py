@@ -0,0 +1,319 @@
+import base64
+import binascii
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+_DEFAULT_THUMBNAIL_SIZE = 200
+_DEFAULT_THUMBNAIL_CACHE_SIZE = 128
+_TRANSPARENT_IMAGE_MODES = {"RGBA", "LA", "P"}
+
+
+def _decode_file_data(data: Union[str, bytes]) -> bytes:
+    if isinstance(data, bytes):
+        return data
+
+    if not isinstance(data, str) or not data:
+        raise ValueError("file data is invalid")
+
+    encoded_data = data
+    if data.startswith("data:"):
+        _, separator, encoded_data = data.partition(",")
+        if not separator:
+            raise ValueError("file data is invalid")
+
+    try:
+        return base64.b64decode(encoded_data)
+    except (ValueError, binascii.Error) as exc:
+        raise ValueError("file data is invalid") from exc
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SQLiteBlobStore:
+    """
+    Content-addressed store for file payloads backed by SQLite
+
+    Each blob is reference counted: `put` adds a reference and `release`
+    drops one, so histories sharing a store only remove their own files.
+
+    Parameters
+    ----------
+    path : str, optional
+        Database file path. Defaults to a temporary file that is removed when
+        the store is closed or garbage collected. Use ":memory:" to keep the
+        payloads in process memory.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        if path is None:
+            file_descriptor, path = tempfile.mkstemp(suffix=".sqlite3")
+            os.close(file_descriptor)
+            self._finalizer: Optional[weakref.finalize] = weakref.finalize(
+                self, _remove_file, path
+            )
+        else:
+            self._finalizer = None
+
+        self.path = path
+        self._lock = threading.Lock()
+        # Streamlit reruns a session's script on different threads.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            "id TEXT PRIMARY KEY, data BLOB NOT NULL, refs INTEGER NOT NULL)"
+        )
+        self._connection.commit()
+
+    def put(self, data: bytes) -> str:
+        blob_id = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO blobs (id, data, refs) VALUES (?, ?, 1) "
+                "ON CONFLICT (id) DO UPDATE SET refs = refs + 1",
+                (blob_id, sqlite3.Binary(data)),
+            )
+            self._connection.commit()
+        return blob_id
+
+    def get(self, blob_id: str) -> bytes:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM blobs WHERE id = ?", (blob_id,)
+            ).fetchone()
+
+        if row is None:
+            raise KeyError(blob_id)
+
+        return bytes(row[0])
+
+    def release(self, blob_id: str) -> None:
+        """Drop one reference to a blob and delete it once none are left."""
+
+        with self._lock:
+            self._connection.execute(
+                "UPDATE blobs SET refs = refs - 1 WHERE id = ?", (blob_id,)
+            )
+            self._connection.execute(
+                "DELETE FROM blobs WHERE id = ? AND refs <= 0", (blob_id,)
+            )
+            self._connection.commit()
+
+    def delete(self, blob_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM blobs WHERE id = ?", (blob_id,))
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """Delete every blob, including those referenced by other histories."""
+
+        with self._lock:
+            self._connection.execute("DELETE FROM blobs")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+class HistoryFile:
+    """Metadata of a stored file; the payload lives in the blob store."""
+
+    __slots__ = ("name", "type", "size", "blob_id")
+
+    def __init__(self, name: str, type: str, size: int, blob_id: str) -> None:
+        self.name = name
+        self.type = type
+        self.size = size
+        self.blob_id = blob_id
+
+    def __repr__(self) -> str:
+        return f"HistoryFile(name={self.name!r}, type={self.type!r}, size={self.size})"
+
+
+class HistoryMessage:
+    """A chat message with its files referenced by blob id."""
+
+    __slots__ = ("role", "text", "files", "audio_metadata")
+
+    def __init__(
+        self,
+        role: str,
+        text: str,
+        files: Tuple[HistoryFile, ...] = (),
+        audio_metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.role = role
+        self.text = text
+        self.files = files
+        self.audio_metadata = audio_metadata
+
+    def __repr__(self) -> str:
+        return (
+            f"HistoryMessage(role={self.role!r}, text={self.text!r}, "
+            f"files={list(self.files)!r})"
+        )
+
+
+class ChatHistory:
+    """
+    Compact chat history for multimodal_chat_input results
+
+    Message text and metadata are kept in memory, while file payloads are
+    decoded once and written to a blob store. Thumbnails are cached, so
+    redrawing a window of messages costs the same however long the
+    conversation gets.
+
+    Parameters
+    ----------
+    blob_store : SQLiteBlobStore, optional
+        Store for file payloads. Defaults to a temporary SQLite file
+    thumbnail_size : int
+        Maximum width and height of thumbnails in pixels
+    thumbnail_cache_size : int
+        Number of thumbnails kept in the LRU cache
+    """
+
+    def __init__(
+        self,
+        blob_store: Optional[SQLiteBlobStore] = None,
+        thumbnail_size: int = _DEFAULT_THUMBNAIL_SIZE,
+        thumbnail_cache_size: int = _DEFAULT_THUMBNAIL_CACHE_SIZE,
+    ) -> None:
+        self._blob_store = blob_store if blob_store is not None else SQLiteBlobStore()
+        self._messages: List[HistoryMessage] = []
+        self._thumbnail_size = thumbnail_size
+        self._thumbnail_cache_size = thumbnail_cache_size
+        self._thumbnails: "OrderedDict[str, Optional[bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[HistoryMessage]:
+        return iter(self._messages)
+
+    def append(self, result: Dict[str, Any], role: str = "user") -> HistoryMessage:
+        """
+        Add a multimodal_chat_input result, moving its files to the blob store
+
+        All files are decoded before any of them is stored, so a result with
+        an unreadable file raises ValueError without leaving blobs behind.
+        """
+
+        raw_files = result.get("files") or []
+        payloads = [_decode_file_data(file.get("data", "")) for file in raw_files]
+
+        blob_ids: List[str] = []
+        try:
+            for payload in payloads:
+                blob_ids.append(self._blob_store.put(payload))
+        except Exception:
+            for blob_id in blob_ids:
+                self._blob_store.release(blob_id)
+            raise
+
+        files = tuple(
+            HistoryFile(
+                name=str(file.get("name", "")),
+                type=str(file.get("type", "")),
+                size=int(file.get("size", 0)),
+                blob_id=blob_id,
+            )
+            for file, blob_id in zip(raw_files, blob_ids)
+        )
+        message = HistoryMessage(
+            role=role,
+            text=str(result.get("text", "")),
+            files=files,
+            audio_metadata=result.get("audio_metadata"),
+        )
+        self._messages.append(message)
+        return message
+
+    def window(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> List[HistoryMessage]:
+        """Return messages[start:stop]; negative indices count from the end."""
+
+        return self._messages[start:stop]
+
+    def latest(self, count: int) -> List[HistoryMessage]:
+        """Return the most recent `count` messages, oldest first."""
+
+        return self._messages[-count:] if count > 0 else []
+
+    def page(self, page: int, page_size: int) -> List[HistoryMessage]:
+        """Return a page of messages, where page 0 holds the oldest ones."""
+
+        if page < 0 or page_size <= 0:
+            raise ValueError("page must be >= 0 and page_size must be positive")
+
+        start = page * page_size
+        return self._messages[start : start + page_size]
+
+    def get_file_data(self, file: HistoryFile) -> bytes:
+        return self._blob_store.get(file.blob_id)
+
+    def get_thumbnail(self, file: HistoryFile) -> Optional[bytes]:
+        """
+        Return a downscaled copy of an image file, cached by blob id
+
+        Returns None for files that cannot be decoded as images (or when
+        Pillow is not installed); only that marker is cached for them, never
+        the file itself. Show such files by name instead.
+        """
+
+        if file.blob_id in self._thumbnails:
+            self._thumbnails.move_to_end(file.blob_id)
+            return self._thumbnails[file.blob_id]
+
+        data = self.get_file_data(file)
+        thumbnail = self._create_thumbnail(data)
+
+        self._thumbnails[file.blob_id] = thumbnail
+        if len(self._thumbnails) > self._thumbnail_cache_size:
+            self._thumbnails.popitem(last=False)
+
+        return thumbnail
+
+    def _create_thumbnail(self, data: bytes) -> Optional[bytes]:
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+
+        try:
+            with Image.open(BytesIO(data)) as image:
+                image.thumbnail((self._thumbnail_size, self._thumbnail_size))
+                output = BytesIO()
+                if image.mode in _TRANSPARENT_IMAGE_MODES:
+                    image.save(output, format="PNG")
+                else:
+                    image.convert("RGB").save(output, format="JPEG")
+                return output.getvalue()
+        except (OSError, ValueError):
+            return None
+
+    def clear(self) -> None:
+        """Remove all messages and release their files from the blob store."""
+
+        for message in self._messages:
+            for file in message.files:
+                self._blob_store.release(file.blob_id)
+
+        self._messages.clear()
+        self._thumbnails.clear()
@@ -0,0 +1,276 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Union
+
+_DEFAULT_MAX_BATCH_SIZE = 8
+_DEFAULT_MAX_WAIT_MS = 50.0
+_DEFAULT_TIMEOUT = 60.0
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TranscriptionItem:
+    """A single recording queued for batch transcription."""
+
+    __slots__ = ("audio", "mime_type", "language", "future", "enqueued_at")
+
+    def __init__(self, audio: bytes, mime_type: str, language: str) -> None:
+        self.audio = audio
+        self.mime_type = mime_type
+        self.language = language
+        self.future: "Future[str]" = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class TranscriptionEngine(Protocol):
+    """Engine that transcribes several recordings in one call."""
+
+    def transcribe_batch(self, items: Sequence[TranscriptionItem]) -> List[str]:
+        """Return one transcript per item, in the same order."""
+        ...
+
+
+class _Stop:
+    pass
+
+
+_STOP = _Stop()
+
+
+class TranscriptionBatchScheduler:
+    """
+    Process-level micro-batching scheduler for local transcription engines
+
+    Requests from all sessions are collected until `max_batch_size` is
+    reached or `max_wait_ms` has passed since the oldest request, then run
+    through the engine as one batch. Share one instance across sessions,
+    e.g. with `st.cache_resource`, and pass it to `multimodal_chat_input`.
+
+    Parameters
+    ----------
+    engine : TranscriptionEngine
+        Object with a `transcribe_batch(items) -> list[str]` method
+    max_batch_size : int
+        Maximum number of recordings per batch
+    max_wait_ms : float
+        Maximum time a request waits for other requests to join its batch
+    timeout : float, optional
+        Seconds `transcribe` waits for a transcript before raising
+        TimeoutError, so a stuck engine cannot block sessions forever.
+        None waits indefinitely
+    """
+
+    def __init__(
+        self,
+        engine: TranscriptionEngine,
+        max_batch_size: int = _DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = _DEFAULT_MAX_WAIT_MS,
+        timeout: Optional[float] = _DEFAULT_TIMEOUT,
+    ) -> None:
+        if (
+            not isinstance(max_batch_size, int)
+            or isinstance(max_batch_size, bool)
+            or max_batch_size <= 0
+        ):
+            raise ValueError("max_batch_size must be a positive integer")
+
+        if (
+            not isinstance(max_wait_ms, (int, float))
+            or isinstance(max_wait_ms, bool)
+            or max_wait_ms < 0
+        ):
+            raise ValueError("max_wait_ms must be a non-negative number")
+
+        if timeout is not None and (
+            not isinstance(timeout, (int, float))
+            or isinstance(timeout, bool)
+            or timeout <= 0
+        ):
+            raise ValueError("timeout must be a positive number or None")
+
+        self._engine = engine
+        self._max_batch_size = max_batch_size
+        self._max_wait_ms = float(max_wait_ms)
+        self._timeout = None if timeout is None else float(timeout)
+        self._queue: "queue.Queue[Union[TranscriptionItem, _Stop]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+        self._requests = 0
+        self._batches = 0
+        self._last_batch_size = 0
+        self._total_wait_ms = 0.0
+        self._max_observed_wait_ms = 0.0
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    @property
+    def max_wait_ms(self) -> float:
+        return self._max_wait_ms
+
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._timeout
+
+    def submit(
+        self, audio: bytes, mime_type: str = "audio/webm", language: str = ""
+    ) -> "Future[str]":
+        """Queue a recording and return a future for its transcript."""
+
+        item = TranscriptionItem(audio, mime_type, language)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("transcription scheduler is closed")
+
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="st-chat-input-multimodal-transcription",
+                    daemon=True,
+                )
+                self._worker.start()
+
+            self._queue.put(item)
+
+        return item.future
+
+    def transcribe(
+        self,
+        audio: bytes,
+        mime_type: str = "audio/webm",
+        language: str = "",
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Queue a recording and block until its batch has been transcribed
+
+        `timeout` defaults to the scheduler's timeout. When it expires the
+        request is cancelled if it has not started yet, and TimeoutError is
+        raised.
+        """
+
+        if timeout is None:
+            timeout = self._timeout
+
+        future = self.submit(audio, mime_type, language)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"transcription did not finish within {timeout} seconds"
+            ) from None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report batching statistics
+
+        Returns
+        -------
+        dict
+            requests, batches, pending, last_batch_size, mean_batch_size,
+            mean_wait_ms and max_wait_ms, where wait is the time from
+            submission until the request's batch started
+        """
+
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "pending": self._queue.qsize(),
+                "last_batch_size": self._last_batch_size,
+                "mean_batch_size": (
+                    self._requests / self._batches if self._batches else 0.0
+                ),
+                "mean_wait_ms": (
+                    self._total_wait_ms / self._requests if self._requests else 0.0
+                ),
+                "max_wait_ms": self._max_observed_wait_ms,
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Transcribe the requests already queued, then stop the worker."""
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            worker = self._worker
+            self._queue.put(_STOP)
+
+        if worker is not None:
+            worker.join(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+
+        while not stopping:
+            first = self._queue.get()
+            if isinstance(first, _Stop):
+                break
+
+            batch = [first]
+            deadline = first.enqueued_at + self._max_wait_ms / 1000
+
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+
+                if isinstance(item, _Stop):
+                    stopping = True
+                    break
+
+                batch.append(item)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[TranscriptionItem]) -> None:
+        # Requests whose caller gave up while they were queued are skipped.
+        batch = [item for item in batch if item.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        started_at = time.monotonic()
+        wait_ms = [(started_at - item.enqueued_at) * 1000 for item in batch]
+
+        with self._lock:
+            self._requests += len(batch)
+            self._batches += 1
+            self._last_batch_size = len(batch)
+            self._total_wait_ms += sum(wait_ms)
+            self._max_observed_wait_ms = max(self._max_observed_wait_ms, *wait_ms)
+
+        _LOGGER.debug(
+            "Transcribing batch of %d (max wait %.1f ms)", len(batch), max(wait_ms)
+        )
+
+        try:
+            transcripts = self._engine.transcribe_batch(batch)
+            if len(transcripts) != len(batch):
+                raise RuntimeError(
+                    "transcription engine returned "
+                    f"{len(transcripts)} results for {len(batch)} requests"
+                )
+        except Exception as exc:
+            for item in batch:
+                item.future.set_exception(exc)
+            return
+
+        for item, transcript in zip(batch, transcripts):
+            item.future.set_result(transcript)
@@ -0,0 +1,241 @@
+import base64
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from st_chat_input_multimodal.history import (
+    ChatHistory,
+    SQLiteBlobStore,
+    _decode_file_data,
+)
+
+
+def _png_bytes(size=(400, 300)):
+    output = BytesIO()
+    Image.new("RGB", size, color=(255, 0, 0)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def _result(text="hello", files=()):
+    return {"text": text, "files": list(files), "audio_metadata": None}
+
+
+# --- _decode_file_data ---
+
+
+def test_decode_file_data_data_uri():
+    encoded = base64.b64encode(b"image").decode()
+    assert _decode_file_data(f"data:image/png;base64,{encoded}") == b"image"
+
+
+def test_decode_file_data_bytes():
+    assert _decode_file_data(b"raw") == b"raw"
+
+
+def test_decode_file_data_invalid():
+    with pytest.raises(ValueError, match="file data is invalid"):
+        _decode_file_data("")
+    with pytest.raises(ValueError, match="file data is invalid"):
+        _decode_file_data("not-valid-base64!!!")
+
+
+# --- SQLiteBlobStore ---
+
+
+def test_blob_store_round_trip_and_dedup():
+    store = SQLiteBlobStore(":memory:")
+    blob_id = store.put(b"payload")
+    assert store.put(b"payload") == blob_id
+    assert store.get(blob_id) == b"payload"
+
+    store.delete(blob_id)
+    with pytest.raises(KeyError):
+        store.get(blob_id)
+
+
+def test_blob_store_temporary_file_is_removed_on_close():
+    store = SQLiteBlobStore()
+    assert os.path.exists(store.path)
+    store.close()
+    assert not os.path.exists(store.path)
+
+
+# --- ChatHistory ---
+
+
+def test_history_moves_payloads_to_blob_store():
+    history = ChatHistory(SQLiteBlobStore(":memory:"))
+    encoded = base64.b64encode(b"abc").decode()
+    message = history.append(
+        _result(
+            files=[
+                {
+                    "name": "a.png",
+                    "type": "image/png",
+                    "size": 3,
+                    "data": f"data:image/png;base64,{encoded}",
+                }
+            ]
+        )
+    )
+
+    assert message.text == "hello"
+    assert message.role == "user"
+    assert not hasattr(message.files[0], "data")
+    assert history.get_file_data(message.files[0]) == b"abc"
+
+
+def test_history_accepts_binary_transport_results():
+    history = ChatHistory(SQLiteBlobStore(":memory:"))
+    message = history.append(
+        _result(
+            files=[{"name": "a.png", "type": "image/png", "size": 3, "data": b"xyz"}]
+        )
+    )
+    assert history.get_file_data(message.files[0]) == b"xyz"
+
+
+def test_history_windows():
+    history = ChatHistory(SQLiteBlobStore(":memory:"))
+    for index in range(10):
+        history.append(_result(text=str(index)))
+
+    assert len(history) == 10
+    assert [message.text for message in history.latest(3)] == ["7", "8", "9"]
+    assert history.latest(0) == []
+    assert [message.text for message in history.page(1, 4)] == ["4", "5", "6", "7"]
+    assert [message.text for message in history.window(-2)] == ["8", "9"]
+    with pytest.raises(ValueError):
+        history.page(-1, 4)
+
+
+def test_history_thumbnail_is_cached():
+    history = ChatHistory(SQLiteBlobStore(":memory:"), thumbnail_size=100)
+    message = history.append(
+        _result(
+            files=[
+                {"name": "a.png", "type": "image/png", "size": 0, "data": _png_bytes()}
+            ]
+        )
+    )
+    file = message.files[0]
+
+    thumbnail = history.get_thumbnail(file)
+    with Image.open(BytesIO(thumbnail)) as image:
+        assert max(image.size) == 100
+    assert history.get_thumbnail(file) is thumbnail
+
+
+def test_history_thumbnail_cache_is_bounded():
+    history = ChatHistory(SQLiteBlobStore(":memory:"), thumbnail_cache_size=1)
+    first = history.append(
+        _result(files=[{"name": "a.png", "data": _png_bytes(size=(10, 10))}])
+    )
+    second = history.append(
+        _result(files=[{"name": "b.png", "data": _png_bytes(size=(20, 20))}])
+    )
+
+    assert history.get_thumbnail(first.files[0]) is not None
+    assert history.get_thumbnail(second.files[0]) is not None
+    assert list(history._thumbnails) == [second.files[0].blob_id]
+
+
+def test_history_thumbnail_of_non_image_is_not_cached():
+    history = ChatHistory(SQLiteBlobStore(":memory:"))
+    message = history.append(
+        _result(files=[{"name": "doc.pdf", "data": b"%PDF" + b"x" * 100_000}])
+    )
+    file = message.files[0]
+
+    assert history.get_thumbnail(file) is None
+    assert history.get_thumbnail(file) is None
+    assert list(history._thumbnails.values()) == [None]
+
+
+def test_history_clear():
+    history = ChatHistory(SQLiteBlobStore(":memory:"))
+    message = history.append(_result(files=[{"name": "a", "data": b"data"}]))
+    history.clear()
+
+    assert len(history) == 0
+    with pytest.raises(KeyError):
+        history.get_file_data(message.files[0])
+
+
+def test_blob_store_release_counts_references():
+    store = SQLiteBlobStore(":memory:")
+    blob_id = store.put(b"payload")
+    store.put(b"payload")
+
+    store.release(blob_id)
+    assert store.get(blob_id) == b"payload"
+
+    store.release(blob_id)
+    with pytest.raises(KeyError):
+        store.get(blob_id)
+
+
+def test_history_clear_keeps_files_of_other_histories():
+    store = SQLiteBlobStore(":memory:")
+    first = ChatHistory(store)
+    second = ChatHistory(store)
+    first.append(_result(files=[{"name": "a", "data": b"shared"}]))
+    kept = second.append(
+        _result(
+            files=[
+                {"name": "b", "data": b"shared"},
+                {"name": "c", "data": b"own"},
+            ]
+        )
+    )
+
+    first.clear()
+    assert second.get_file_data(kept.files[0]) == b"shared"
+    assert second.get_file_data(kept.files[1]) == b"own"
+
+    second.clear()
+    with pytest.raises(KeyError):
+        store.get(kept.files[0].blob_id)
+
+
+def test_history_append_with_unreadable_file_stores_nothing():
+    store = SQLiteBlobStore(":memory:")
+    history = ChatHistory(store)
+
+    with pytest.raises(ValueError):
+        history.append(
+            _result(
+                files=[
+                    {"name": "ok", "data": b"stored"},
+                    {"name": "broken", "data": "not-valid-base64!!!"},
+                ]
+            )
+        )
+
+    assert len(history) == 0
+    assert store._connection.execute("SELECT COUNT(*) FROM blobs").fetchone() == (0,)
+
+
+def test_history_append_releases_blobs_when_store_fails():
+    class FailingStore(SQLiteBlobStore):
+        def put(self, data):
+            if data == b"second":
+                raise OSError("disk full")
+            return super().put(data)
+
+    store = FailingStore(":memory:")
+    history = ChatHistory(store)
+
+    with pytest.raises(OSError):
+        history.append(
+            _result(
+                files=[
+                    {"name": "a", "data": b"first"},
+                    {"name": "b", "data": b"second"},
+                ]
+            )
+        )
+
+    assert store._connection.execute("SELECT COUNT(*) FROM blobs").fetchone() == (0,)
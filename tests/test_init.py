@@ -1,15 +1,33 @@
 import base64
 import hashlib
+import json
+import subprocess
+import sys
+import zlib
+from contextlib import nullcontext
+from types import SimpleNamespace
 
 import pytest
 
+import st_chat_input_multimodal
 from st_chat_input_multimodal import (
-    _build_session_state_key,
+    TranscriptionBatchScheduler,
+    _ComponentSessionState,
+    configure_session_state,
+    multimodal_chat_input,
     _decode_audio_data,
+    _decode_binary_value,
+    _get_audio_sample_digest,
+    _get_cached_transcription_request_fingerprint,
+    _get_component_func,
     _get_transcription_error_message,
     _get_transcription_request,
     _get_transcription_request_fingerprint,
+    _get_value_identity,
     _is_positive_integer,
+    _KeyState,
+    _pop_transcription_feedback,
+    _set_transcription_feedback,
     _validate_component_parameters,
     _TRANSCRIPTION_FALLBACK_MESSAGE,
     _TRANSCRIPTION_INVALID_AUDIO_MESSAGE,
@@ -101,6 +119,23 @@ def test_validate_invalid_max_recording_time():
         _validate_component_parameters(**_valid_params(max_recording_time=True))
 
 
+def test_validate_local_method_requires_scheduler():
+    scheduler = TranscriptionBatchScheduler(lambda items: [])
+    _validate_component_parameters(
+        **_valid_params(voice_recognition_method="local"),
+        transcription_scheduler=scheduler,
+    )
+    with pytest.raises(ValueError, match="transcription_scheduler is required"):
+        _validate_component_parameters(
+            **_valid_params(voice_recognition_method="local")
+        )
+    with pytest.raises(ValueError, match="requires voice_recognition_method='local'"):
+        _validate_component_parameters(
+            **_valid_params(voice_recognition_method="openai_whisper"),
+            transcription_scheduler=scheduler,
+        )
+
+
 def test_validate_invalid_voice_recognition_method():
     with pytest.raises(ValueError, match="voice_recognition_method"):
         _validate_component_parameters(
@@ -135,6 +170,12 @@ def test_decode_audio_data_valid_base64_without_data_uri():
     assert mime_type == "audio/webm"  # default
 
 
+def test_decode_audio_data_raw_bytes():
+    audio_bytes, mime_type = _decode_audio_data(b"raw audio", "audio/MP4")
+    assert audio_bytes == b"raw audio"
+    assert mime_type == "audio/mp4"
+
+
 def test_decode_audio_data_invalid_base64():
     with pytest.raises(ValueError, match="audio_data is invalid"):
         _decode_audio_data("not-valid-base64!!!")
@@ -257,6 +298,12 @@ def test_fingerprint_without_request_id_with_audio_data():
     assert result == expected
 
 
+def test_fingerprint_without_request_id_with_binary_audio_data():
+    audio = b"\x00\x01binary"
+    expected = hashlib.sha256(audio).hexdigest()
+    assert _get_transcription_request_fingerprint({"audio_data": audio}) == expected
+
+
 def test_fingerprint_without_request_id_or_audio_data():
     req = {"foo": "bar"}
     expected = hashlib.sha256(repr(req).encode("utf-8")).hexdigest()
@@ -264,9 +311,463 @@ def test_fingerprint_without_request_id_or_audio_data():
     assert result == expected
 
 
-# --- _build_session_state_key ---
+def _verified_request(audio, request_id="req-1"):
+    return {
+        "request_id": request_id,
+        "audio_data": audio,
+        "audio_size": len(audio),
+        "audio_digest": _get_audio_sample_digest(audio),
+    }
+
+
+def test_fingerprint_uses_verified_request_id():
+    request = _verified_request("data:audio/webm;base64,QUJD")
+    assert _get_transcription_request_fingerprint(request) == "req-1"
+
+
+def test_fingerprint_falls_back_to_hash_when_digest_does_not_match():
+    audio = "data:audio/webm;base64,QUJD"
+    request = _verified_request(audio)
+    request["audio_digest"] = "00000000"
+    expected = hashlib.sha256(audio.encode("utf-8")).hexdigest()
+    assert _get_transcription_request_fingerprint(request) == expected
+
+
+def test_fingerprint_falls_back_to_hash_when_size_does_not_match():
+    audio = b"\x00\x01binary"
+    request = _verified_request(audio)
+    request["audio_size"] = len(audio) + 1
+    expected = hashlib.sha256(audio).hexdigest()
+    assert _get_transcription_request_fingerprint(request) == expected
+
+
+# --- _get_audio_sample_digest ---
+
+
+def test_audio_sample_digest_short_payload_covers_everything():
+    assert _get_audio_sample_digest(b"abc") == f"{zlib.crc32(b'abc'):08x}"
+    assert _get_audio_sample_digest("abc") == _get_audio_sample_digest(b"abc")
+
+
+def test_audio_sample_digest_samples_head_and_tail():
+    audio = bytes(range(256)) * 100
+    changed_middle = audio[:12000] + b"\xff" + audio[12001:]
+    changed_tail = audio[:-1] + b"\x00"
+
+    assert _get_audio_sample_digest(audio) == _get_audio_sample_digest(changed_middle)
+    assert _get_audio_sample_digest(audio) != _get_audio_sample_digest(changed_tail)
+
+
+# --- _get_cached_transcription_request_fingerprint ---
+
+
+def _count_fingerprints(monkeypatch):
+    calls = []
+    original = st_chat_input_multimodal._get_transcription_request_fingerprint
+
+    def counting_fingerprint(request):
+        calls.append(request)
+        return original(request)
+
+    monkeypatch.setattr(
+        st_chat_input_multimodal,
+        "_get_transcription_request_fingerprint",
+        counting_fingerprint,
+    )
+    return calls
+
+
+def test_cached_fingerprint_hashes_unchanged_request_once(monkeypatch):
+    calls = _count_fingerprints(monkeypatch)
+    record = _KeyState()
+    request = _verified_request("data:audio/webm;base64," + "QUJD" * 10000)
+
+    first = _get_cached_transcription_request_fingerprint(record, request)
+    second = _get_cached_transcription_request_fingerprint(record, dict(request))
+
+    assert first == second == "req-1"
+    assert len(calls) == 1
+
+
+def test_cached_fingerprint_does_not_memoize_requests_without_id(monkeypatch):
+    calls = _count_fingerprints(monkeypatch)
+    record = _KeyState()
+    head, tail = "data:audio/webm;base64," + "A" * 5000, "B" * 5000
+    first_audio = head + "C" * 100 + tail
+    second_audio = head + "D" * 100 + tail
+
+    first = _get_cached_transcription_request_fingerprint(
+        record, {"audio_data": first_audio}
+    )
+    second = _get_cached_transcription_request_fingerprint(
+        record, {"audio_data": second_audio}
+    )
+
+    assert first == hashlib.sha256(first_audio.encode("utf-8")).hexdigest()
+    assert second == hashlib.sha256(second_audio.encode("utf-8")).hexdigest()
+    assert len(calls) == 2
+    assert record.request_fingerprint_cache is None
+
+
+def test_cached_fingerprint_memoizes_request_without_id_by_identity(monkeypatch):
+    calls = _count_fingerprints(monkeypatch)
+    record = _KeyState()
+    request = {"audio_data": "data:audio/webm;base64," + "QUJD" * 10000}
+
+    first = _get_cached_transcription_request_fingerprint(record, request)
+    second = _get_cached_transcription_request_fingerprint(record, request)
+
+    assert first == second
+    assert len(calls) == 1
+    assert record.request_fingerprint_cache is None
+
+
+def test_cached_fingerprint_does_not_trust_unverified_request(monkeypatch):
+    calls = _count_fingerprints(monkeypatch)
+    record = _KeyState()
+    request = _verified_request(b"payload")
+    request["audio_digest"] = "00000000"
+    expected = hashlib.sha256(b"payload").hexdigest()
+
+    assert _get_cached_transcription_request_fingerprint(record, request) == expected
+    assert _get_cached_transcription_request_fingerprint(record, request) == expected
+    assert len(calls) == 1
+    assert record.request_fingerprint_cache is None
+
+    # An equal but new object (a new value from the browser) is hashed again.
+    assert (
+        _get_cached_transcription_request_fingerprint(record, dict(request)) == expected
+    )
+    assert len(calls) == 2
+
+
+def test_cached_fingerprint_changes_with_request():
+    record = _KeyState()
+
+    first = _get_cached_transcription_request_fingerprint(
+        record, _verified_request(b"first", request_id="a")
+    )
+    second = _get_cached_transcription_request_fingerprint(
+        record, _verified_request(b"second", request_id="b")
+    )
+
+    assert (first, second) == ("a", "b")
+
+
+# --- _decode_binary_value ---
+
+
+def _encode_binary_value(value, parts):
+    header = json.dumps({"value": value, "parts": [len(part) for part in parts]})
+    header_bytes = header.encode("utf-8")
+    return len(header_bytes).to_bytes(4, "big") + header_bytes + b"".join(parts)
+
+
+def test_decode_binary_value_restores_parts():
+    payload = _encode_binary_value(
+        {
+            "text": "hi",
+            "files": [
+                {"name": "a.png", "data": {"__binary_part__": 0}},
+                {"name": "b.png", "data": {"__binary_part__": 1}},
+            ],
+            "_timestamp": 1,
+        },
+        [b"\x89PNG", b""],
+    )
+    value = _decode_binary_value(payload)
+    assert value["text"] == "hi"
+    assert value["files"][0]["data"] == b"\x89PNG"
+    assert value["files"][1]["data"] == b""
+    assert value["_timestamp"] == 1
+
+
+def test_decode_binary_value_without_parts():
+    assert _decode_binary_value(_encode_binary_value({"text": "hi"}, [])) == {
+        "text": "hi"
+    }
+
+
+def test_decode_binary_value_truncated():
+    payload = _encode_binary_value({"data": {"__binary_part__": 0}}, [b"abcdef"])
+    with pytest.raises(ValueError, match="binary payload is invalid"):
+        _decode_binary_value(payload[:-1])
+    with pytest.raises(ValueError, match="binary payload is invalid"):
+        _decode_binary_value(payload[:3])
+
+
+def test_decode_binary_value_invalid_header():
+    with pytest.raises(ValueError, match="binary payload is invalid"):
+        _decode_binary_value((3).to_bytes(4, "big") + b"{{{")
+
+
+def test_decode_binary_value_unknown_part():
+    payload = _encode_binary_value({"data": {"__binary_part__": 1}}, [b"abc"])
+    with pytest.raises(ValueError, match="binary payload is invalid"):
+        _decode_binary_value(payload)
+
+
+def test_binary_value_is_decoded_once_per_payload(monkeypatch):
+    payload = _encode_binary_value(
+        {"text": "hi", "files": [{"data": {"__binary_part__": 0}}], "_timestamp": 1},
+        [b"\x89PNG"],
+    )
+    decoded = []
+
+    def counting_decode(value):
+        decoded.append(value)
+        return _decode_binary_value(value)
+
+    monkeypatch.setattr(st_chat_input_multimodal.st, "session_state", {})
+    monkeypatch.setattr(st_chat_input_multimodal.st, "_bottom", nullcontext())
+    monkeypatch.setattr(
+        st_chat_input_multimodal, "_get_component_func", lambda: lambda **_: payload
+    )
+    monkeypatch.setattr(
+        st_chat_input_multimodal, "_decode_binary_value", counting_decode
+    )
+
+    first = multimodal_chat_input(binary_transport=True, key="chat")
+    second = multimodal_chat_input(binary_transport=True, key="chat")
+
+    assert first == {"text": "hi", "files": [{"data": b"\x89PNG"}]}
+    assert second is None
+    assert len(decoded) == 1
+
+
+# --- _ComponentSessionState ---
+
+
+def test_session_state_reuses_record_per_key():
+    state = _ComponentSessionState()
+    record = state.mark_rendered("chat")
+    assert state.mark_rendered("chat") is record
+    assert list(state.records) == ["chat"]
+
+
+def test_session_state_counts_reruns_on_repeated_key():
+    state = _ComponentSessionState()
+    state.mark_rendered("a")
+    state.mark_rendered("b")
+    assert state.run_count == 0
+
+    state.mark_rendered("a")
+    assert state.run_count == 1
+    assert state.records["a"].last_rendered_run == 1
+    assert state.records["b"].last_rendered_run == 0
+
+
+def test_session_state_keeps_records_without_policy():
+    state = _ComponentSessionState()
+    state.mark_rendered("stale")
+    for _ in range(50):
+        state.mark_rendered("active")
+    assert "stale" in state.records
+
+
+def test_session_state_evicts_idle_keys():
+    state = _ComponentSessionState()
+    state.max_idle_reruns = 2
+    state.mark_rendered("stale")
+    state.mark_rendered("active")
+
+    state.mark_rendered("active")
+    state.mark_rendered("active")
+    assert "stale" in state.records
+
+    state.mark_rendered("active")
+    assert "stale" not in state.records
+    assert "active" in state.records
+
+
+def test_session_state_counts_every_run_with_run_marker():
+    state = _ComponentSessionState()
+    state.max_idle_reruns = 2
+
+    for key in "ABABCDEFGH":
+        state.mark_rendered(key, run_marker={})
+
+    assert state.run_count == 10
+    assert set(state.records) == {"F", "G", "H"}
+
+
+def test_session_state_run_marker_counts_run_once():
+    state = _ComponentSessionState()
+    marker = {}
+    state.mark_rendered("a", run_marker=marker)
+    state.mark_rendered("b", run_marker=marker)
+    state.observe_run(marker)
+
+    assert state.run_count == 1
+
+
+def test_configure_session_state_counts_runs_without_input(monkeypatch):
+    markers = []
+    monkeypatch.setattr(
+        st_chat_input_multimodal, "_get_run_marker", lambda: markers[-1]
+    )
+    monkeypatch.setattr(st_chat_input_multimodal.st, "session_state", {})
+
+    markers.append({})
+    state = st_chat_input_multimodal._get_component_session_state()
+    state.mark_rendered("chat", st_chat_input_multimodal._get_run_marker())
+    configure_session_state(max_idle_reruns=2)
+
+    for _ in range(3):
+        markers.append({})
+        configure_session_state(max_idle_reruns=2)
+
+    assert state.records == {}
+
+
+def test_session_state_restores_consumed_values_after_eviction():
+    state = _ComponentSessionState()
+    state.max_idle_reruns = 1
+    record = state.mark_rendered("chat", run_marker={})
+    record.last_value_id = 123
+    record.processed_request = "req-1"
+
+    for _ in range(2):
+        state.mark_rendered("other", run_marker={})
+    assert "chat" not in state.records
+
+    restored = state.mark_rendered("chat", run_marker={})
+    assert restored is not record
+    assert (restored.last_value_id, restored.processed_request) == (123, "req-1")
+    assert "chat" not in state.tombstones
+
+
+def test_evicted_input_does_not_return_old_value_again(monkeypatch):
+    markers = [{}]
+    value = {"text": "hi", "files": [], "audio_metadata": None, "_timestamp": 1}
+    component_values = {"chat": value, "other": None}
+
+    def fake_component(**kwargs):
+        return component_values[kwargs["key"]]
+
+    monkeypatch.setattr(st_chat_input_multimodal.st, "session_state", {})
+    monkeypatch.setattr(st_chat_input_multimodal.st, "_bottom", nullcontext())
+    monkeypatch.setattr(
+        st_chat_input_multimodal, "_get_run_marker", lambda: markers[-1]
+    )
+    monkeypatch.setattr(
+        st_chat_input_multimodal, "_get_component_func", lambda: fake_component
+    )
+    configure_session_state(max_idle_reruns=2)
+    assert multimodal_chat_input(key="chat")["text"] == "hi"
+
+    for _ in range(3):
+        markers.append({})
+        multimodal_chat_input(key="other")
+    state = st_chat_input_multimodal._get_component_session_state()
+    assert "chat" not in state.records
+
+    markers.append({})
+    assert multimodal_chat_input(key="chat") is None
+
+
+def test_fragment_runs_are_not_counted(monkeypatch):
+    ctx = SimpleNamespace(cursors={}, fragment_ids_this_run=None)
+    monkeypatch.setattr(st_chat_input_multimodal, "get_script_run_ctx", lambda: ctx)
+    state = _ComponentSessionState()
+    state.mark_rendered("chat", st_chat_input_multimodal._get_run_marker())
+
+    for _ in range(5):
+        ctx.cursors = {}
+        ctx.fragment_ids_this_run = ["fragment"]
+        state.mark_rendered("in_fragment", st_chat_input_multimodal._get_run_marker())
+    assert state.run_count == 1
+
+    ctx.cursors = {}
+    ctx.fragment_ids_this_run = None
+    state.mark_rendered("chat", st_chat_input_multimodal._get_run_marker())
+    assert state.run_count == 2
+
+
+def test_session_state_memory_usage_per_key():
+    state = _ComponentSessionState()
+    small = state.mark_rendered("small")
+    large = state.mark_rendered("large")
+    large.transcription_result = "x" * 10_000
+
+    usage = state.memory_usage()
+    assert set(usage) == {"small", "large"}
+    assert usage["large"] - usage["small"] >= 10_000
+    assert small.transcription_result is None
+
+
+def test_transcription_feedback_is_popped_once():
+    state = _ComponentSessionState()
+    record = state.mark_rendered("chat")
+    _set_transcription_feedback(record, "req-1", transcription_result="hello")
+
+    assert _pop_transcription_feedback(record) == ("hello", None, "req-1")
+    assert _pop_transcription_feedback(record) == (None, None, None)
+    assert record.processed_request == "req-1"
+
+
+# --- _get_value_identity ---
+
+
+def test_value_identity_uses_timestamp():
+    value = {"text": "hi", "files": [{"data": "x" * 1000}], "_timestamp": 123}
+    assert _get_value_identity(value) == 123
+
+
+def test_value_identity_without_timestamp():
+    value = {"text": "hi"}
+    assert _get_value_identity(value) is value
+
+
+# --- _get_component_func ---
+
+
+def test_component_is_declared_lazily_and_once(monkeypatch):
+    import streamlit.components.v1 as components
+
+    calls = []
+
+    def fake_declare_component(name, **kwargs):
+        calls.append(name)
+        return lambda **component_kwargs: None
+
+    monkeypatch.setattr(components, "declare_component", fake_declare_component)
+    monkeypatch.setattr(st_chat_input_multimodal, "_component_func", None)
+
+    component_func = _get_component_func()
+    assert _get_component_func() is component_func
+    assert calls == ["st_chat_input_multimodal"]
+
+
+def test_import_does_not_declare_component():
+    code = (
+        "import streamlit.components.v1 as components\n"
+        "calls = []\n"
+        "components.declare_component = lambda *args, **kwargs: calls.append(args)\n"
+        "import st_chat_input_multimodal\n"
+        "assert st_chat_input_multimodal._component_func is None\n"
+        "assert calls == [], calls\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+# --- lazy re-exports ---
+
+
+def test_optional_helpers_are_imported_on_first_access():
+    code = (
+        "import sys\n"
+        "import st_chat_input_multimodal as package\n"
+        "lazy = ('st_chat_input_multimodal.history', "
+        "'st_chat_input_multimodal.transcription')\n"
+        "assert not any(name in sys.modules for name in lazy), sys.modules.keys()\n"
+        "assert package.ChatHistory.__module__ == lazy[0]\n"
+        "assert package.TranscriptionBatchScheduler.__module__ == lazy[1]\n"
+        "assert 'SQLiteBlobStore' in dir(package)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
 
 
-def test_build_session_state_key():
-    result = _build_session_state_key("my_key", "suffix")
-    assert result == "_st_chat_input_multimodal_suffix_my_key"
+def test_unknown_attribute_raises_attribute_error():
+    with pytest.raises(AttributeError, match="no_such_name"):
+        st_chat_input_multimodal.no_such_name
@@ -0,0 +1,219 @@
+import base64
+import threading
+
+import pytest
+
+from st_chat_input_multimodal import (
+    _TRANSCRIPTION_TEMPORARY_FAILURE_MESSAGE,
+    _get_transcription_error_message,
+    _transcribe_audio,
+)
+from st_chat_input_multimodal.transcription import TranscriptionBatchScheduler
+
+
+class FakeEngine:
+    """Deterministic engine: echoes "<language>:<audio>" for each item."""
+
+    def __init__(self, error=None, drop_results=False):
+        self.batches = []
+        self.error = error
+        self.drop_results = drop_results
+
+    def transcribe_batch(self, items):
+        self.batches.append([item.audio for item in items])
+        if self.error is not None:
+            raise self.error
+        results = [f"{item.language}:{item.audio.decode()}" for item in items]
+        return results[:-1] if self.drop_results else results
+
+
+@pytest.fixture
+def make_scheduler():
+    schedulers = []
+
+    def factory(engine, **kwargs):
+        scheduler = TranscriptionBatchScheduler(engine, **kwargs)
+        schedulers.append(scheduler)
+        return scheduler
+
+    yield factory
+
+    for scheduler in schedulers:
+        scheduler.close(timeout=5)
+
+
+def test_scheduler_runs_concurrent_requests_as_one_batch(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine, max_batch_size=4, max_wait_ms=5000)
+
+    futures = [scheduler.submit(f"a{i}".encode(), language="en") for i in range(4)]
+
+    assert [future.result(timeout=5) for future in futures] == [
+        "en:a0",
+        "en:a1",
+        "en:a2",
+        "en:a3",
+    ]
+    assert engine.batches == [[b"a0", b"a1", b"a2", b"a3"]]
+
+
+def test_scheduler_splits_by_max_batch_size(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine, max_batch_size=2, max_wait_ms=200)
+
+    futures = [scheduler.submit(str(i).encode()) for i in range(5)]
+    for future in futures:
+        future.result(timeout=5)
+
+    assert [len(batch) for batch in engine.batches] == [2, 2, 1]
+
+
+def test_scheduler_flushes_after_max_wait(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine, max_batch_size=8, max_wait_ms=10)
+
+    assert scheduler.transcribe(b"solo", language="ja", timeout=5) == "ja:solo"
+    assert engine.batches == [[b"solo"]]
+
+
+def test_scheduler_routes_results_across_threads(make_scheduler):
+    engine = FakeEngine()
+    scheduler = make_scheduler(engine, max_batch_size=8, max_wait_ms=100)
+    results = {}
+
+    def session(name):
+        results[name] = scheduler.transcribe(name.encode(), timeout=5)
+
+    threads = [threading.Thread(target=session, args=(f"s{i}",)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {f"s{i}": f":s{i}" for i in range(6)}
+
+
+def test_scheduler_propagates_engine_errors(make_scheduler):
+    scheduler = make_scheduler(
+        FakeEngine(error=ConnectionError("down")), max_batch_size=2, max_wait_ms=5000
+    )
+    futures = [scheduler.submit(b"a"), scheduler.submit(b"b")]
+
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(timeout=5)
+
+
+def test_scheduler_rejects_mismatched_result_count(make_scheduler):
+    scheduler = make_scheduler(FakeEngine(drop_results=True), max_wait_ms=0)
+
+    with pytest.raises(RuntimeError, match="returned 0 results for 1 requests"):
+        scheduler.transcribe(b"a", timeout=5)
+
+
+def test_scheduler_stats(make_scheduler):
+    scheduler = make_scheduler(FakeEngine(), max_batch_size=3, max_wait_ms=5000)
+    assert scheduler.max_batch_size == 3
+    assert scheduler.max_wait_ms == 5000
+
+    for future in [
+        scheduler.submit(b"a"),
+        scheduler.submit(b"b"),
+        scheduler.submit(b"c"),
+    ]:
+        future.result(timeout=5)
+
+    stats = scheduler.stats()
+    assert stats["requests"] == 3
+    assert stats["batches"] == 1
+    assert stats["pending"] == 0
+    assert stats["last_batch_size"] == 3
+    assert stats["mean_batch_size"] == 3
+    assert 0 <= stats["mean_wait_ms"] <= stats["max_wait_ms"]
+
+
+def test_scheduler_close_finishes_queued_requests():
+    engine = FakeEngine()
+    scheduler = TranscriptionBatchScheduler(engine, max_batch_size=8, max_wait_ms=5000)
+    future = scheduler.submit(b"queued")
+    scheduler.close(timeout=5)
+
+    assert future.result(timeout=5) == ":queued"
+    with pytest.raises(RuntimeError, match="closed"):
+        scheduler.submit(b"late")
+
+
+def test_scheduler_times_out_and_skips_cancelled_requests(make_scheduler):
+    release = threading.Event()
+    seen = []
+
+    class BlockingEngine:
+        def transcribe_batch(self, items):
+            seen.extend(item.audio for item in items)
+            release.wait(timeout=5)
+            return ["done" for _ in items]
+
+    scheduler = make_scheduler(
+        BlockingEngine(), max_batch_size=1, max_wait_ms=0, timeout=0.05
+    )
+    assert scheduler.timeout == 0.05
+
+    stuck = scheduler.submit(b"stuck")
+    with pytest.raises(TimeoutError, match="0.05 seconds"):
+        scheduler.transcribe(b"queued")
+
+    release.set()
+    assert stuck.result(timeout=5) == "done"
+    scheduler.close(timeout=5)
+    assert seen == [b"stuck"]
+
+
+def test_transcribe_audio_reports_timeout_as_temporary_failure(make_scheduler):
+    release = threading.Event()
+
+    class StuckEngine:
+        def transcribe_batch(self, items):
+            release.wait(timeout=5)
+            return ["" for _ in items]
+
+    scheduler = make_scheduler(StuckEngine(), max_wait_ms=0, timeout=0.01)
+    try:
+        with pytest.raises(TimeoutError) as exc_info:
+            _transcribe_audio(
+                audio_data=b"voice",
+                language="en-US",
+                openai_api_key=None,
+                transcription_scheduler=scheduler,
+            )
+    finally:
+        release.set()
+
+    assert (
+        _get_transcription_error_message(exc_info.value)
+        == _TRANSCRIPTION_TEMPORARY_FAILURE_MESSAGE
+    )
+
+
+def test_scheduler_validates_parameters():
+    with pytest.raises(ValueError, match="max_batch_size"):
+        TranscriptionBatchScheduler(FakeEngine(), max_batch_size=0)
+    with pytest.raises(ValueError, match="max_batch_size"):
+        TranscriptionBatchScheduler(FakeEngine(), max_batch_size=True)
+    with pytest.raises(ValueError, match="max_wait_ms"):
+        TranscriptionBatchScheduler(FakeEngine(), max_wait_ms=-1)
+    with pytest.raises(ValueError, match="timeout"):
+        TranscriptionBatchScheduler(FakeEngine(), timeout=0)
+
+
+def test_transcribe_audio_uses_scheduler(make_scheduler):
+    scheduler = make_scheduler(FakeEngine(), max_wait_ms=0)
+    encoded = base64.b64encode(b"voice").decode()
+
+    result = _transcribe_audio(
+        audio_data=f"data:audio/webm;base64,{encoded}",
+        language="ja-JP",
+        openai_api_key=None,
+        transcription_scheduler=scheduler,
+    )
+
+    assert result == "ja:voice"